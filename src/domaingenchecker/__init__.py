@@ -9,10 +9,13 @@ __version__ = "2.1.1"
 __author__ = "Greg Huff"
 __email__ = "srnetadmin@users.noreply.github.com"
 
-from .config import Config
-from .dns_checker import DNSChecker
-from .domain_generator import DomainGenerator
-from .output_handler import OutputHandler
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .config import Config
+    from .dns_checker import DNSChecker
+    from .domain_generator import DomainGenerator
+    from .output_handler import OutputHandler
 
 __all__ = [
     "DomainGenerator",
@@ -20,3 +23,21 @@ __all__ = [
     "OutputHandler",
     "Config",
 ]
+
+# Public classes are imported on first access so that importing the package
+# (e.g. for the CLI's --version) does not load pydantic, dnspython or Rich
+_LAZY_IMPORTS = {
+    "Config": ".config",
+    "DNSChecker": ".dns_checker",
+    "DomainGenerator": ".domain_generator",
+    "OutputHandler": ".output_handler",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        import importlib
+
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,27 +3,82 @@ Command-line interface for DomainGenChecker.
 """
 
 import asyncio
+import functools
 import logging
+import mmap
+import os
+import sqlite3
+import stat
 import sys
+import time
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import (
+    TYPE_CHECKING,
+    Deque,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import click
-from rich.console import Console
 
 from . import __version__
-from .config import Config, LogLevel, OutputFormat
-from .dns_checker import DNSChecker
-from .domain_generator import DomainGenerator
-from .output_handler import OutputHandler
 
-console = Console()
+# Rich, pydantic and dnspython are imported lazily so that fast paths such as
+# --version do not pay for them
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from .config import Config
+    from .dns_checker import DNSChecker, DNSResult, PersistentDNSCache
+
 logger = logging.getLogger(__name__)
 
+# Number of DNS batches allowed to run concurrently in run_domain_check
+_MAX_INFLIGHT_BATCHES = 2
+
+# Adaptive DNS batch sizing: batches finishing faster than _FAST_BATCH_SECONDS
+# double in size, batches slower than _SLOW_BATCH_SECONDS are halved
+_INITIAL_BATCH_SIZE = 1000
+_MIN_BATCH_SIZE = 100
+_MAX_BATCH_SIZE = 10000
+_FAST_BATCH_SECONDS = 0.2
+_SLOW_BATCH_SECONDS = 2.0
+
+# Minimum seconds between progress updates that advance less than 1%
+_PROGRESS_INTERVAL = 0.1
+
+# Runs that can generate at most this many variations skip the health check
+_HEALTH_CHECK_MIN_VARIATIONS = 10
+
+
+@functools.lru_cache(maxsize=None)
+def _console() -> "Console":
+    """Return the shared Rich console, importing Rich on first use."""
+    from rich.console import Console
+
+    return Console()
 
-def load_tlds(tld_file: Path, max_length: int = 10) -> Set[str]:
+
+@functools.lru_cache(maxsize=None)
+def _default_tld_file() -> Optional[Path]:
+    """Return the bundled TLD file in the data directory, if present."""
+    package_dir = Path(__file__).parent.parent.parent
+    default_tld_file = package_dir / "data" / "tlds-alpha-by-domain.txt"
+    return default_tld_file if default_tld_file.exists() else None
+
+
+def load_tlds(tld_file: Path, max_length: int = 10) -> FrozenSet[str]:
     """Load TLDs from file.
 
+    Results are cached per resolved path, modification time and maximum
+    length, so repeated runs in the same process only parse the file once.
+
     Args:
         tld_file: Path to TLD file
         max_length: Maximum TLD length
@@ -31,24 +86,40 @@ def load_tlds(tld_file: Path, max_length: int = 10) -> Set[str]:
     Returns:
         Set of valid TLDs
     """
-    tlds = set()
     try:
-        with open(tld_file, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip().lower()
-                if line and not line.startswith("#") and 2 <= len(line) <= max_length:
-                    tlds.add(line)
+        mtime_ns = tld_file.stat().st_mtime_ns
+        tlds = _load_tlds_cached(str(tld_file.resolve()), mtime_ns, max_length)
         logger.info(f"Loaded {len(tlds)} TLDs from {tld_file}")
     except FileNotFoundError:
-        console.print(f"[red]Error: TLD file not found: {tld_file}[/red]")
+        _console().print(f"[red]Error: TLD file not found: {tld_file}[/red]")
         sys.exit(1)
     except Exception as e:
-        console.print(f"[red]Error loading TLD file: {e}[/red]")
+        _console().print(f"[red]Error loading TLD file: {e}[/red]")
         sys.exit(1)
 
     return tlds
 
 
+@functools.lru_cache(maxsize=8)
+def _load_tlds_cached(tld_path: str, mtime_ns: int, max_length: int) -> FrozenSet[str]:
+    """Parse a TLD file; ``mtime_ns`` only invalidates the cache key."""
+    return _load_tlds_impl(Path(tld_path), max_length)
+
+
+def _load_tlds_impl(tld_file: Path, max_length: int) -> FrozenSet[str]:
+    """Parse a TLD file into a frozen set of lowercase TLDs."""
+    lines = tld_file.read_bytes().split(b"\n")
+    # Build the frozenset directly rather than copying an intermediate set;
+    # only accepted entries are lowercased
+    return frozenset(
+        tld.lower().decode("utf-8")
+        for line in lines
+        if (tld := line.strip())
+        and not tld.startswith(b"#")
+        and 2 <= len(tld) <= max_length
+    )
+
+
 def load_single_domain(domain_name: str) -> List[str]:
     """Load a single domain name.
 
@@ -76,17 +147,34 @@ def load_domains_from_file(domains_file: Path) -> List[str]:
         FileNotFoundError: If the file doesn't exist
         Exception: For other file reading errors
     """
-    domains = []
-
     if not domains_file.exists():
         raise FileNotFoundError(f"Domains file not found: {domains_file}")
 
     try:
-        with open(domains_file, "r", encoding="utf-8") as f:
-            for line in f:
-                domain = line.strip().lower()
-                if domain and not domain.startswith("#"):
-                    domains.append(domain)
+        with open(domains_file, "rb") as f:
+            st = os.fstat(f.fileno())
+            lines: Iterable[bytes]
+            # Only non-empty regular files can be mapped; pipes, FIFOs and
+            # process substitutions report a size of 0 and are read instead
+            if stat.S_ISREG(st.st_mode) and st.st_size > 0:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                lines = iter(mm.readline, b"")
+            else:
+                mm = None
+                lines = f.read().split(b"\n")
+
+            try:
+                # Filter on raw bytes; only accepted lines are decoded
+                domains = [
+                    domain.decode("utf-8").lower()
+                    for line in lines
+                    if (domain := line.strip()) and not domain.startswith(b"#")
+                ]
+            finally:
+                if mm is not None:
+                    mm.close()
         logger.info(f"Loaded {len(domains)} input domains from {domains_file}")
     except Exception as e:
         raise Exception(f"Error reading domains file {domains_file}: {e}")
@@ -157,6 +245,11 @@ def load_domains_from_file(domains_file: Path) -> List[str]:
     help="Custom DNS nameservers (can be specified multiple times)",
 )
 @click.option("--no-cache", is_flag=True, help="Disable DNS result caching")
+@click.option(
+    "--persistent-cache",
+    is_flag=True,
+    help="Cache DNS results on disk between runs",
+)
 @click.option(
     "--include-unresolved/--exclude-unresolved",
     default=True,
@@ -211,7 +304,7 @@ def load_domains_from_file(domains_file: Path) -> List[str]:
 def main(
     domain: str,
     file: Path,
-    tld_file: Path,
+    tld_file: Optional[Path],
     max_variants: int,
     max_tld_length: int,
     output: Path,
@@ -222,6 +315,7 @@ def main(
     retries: int,
     nameservers: tuple,
     no_cache: bool,
+    persistent_cache: bool,
     include_unresolved: bool,
     no_statistics: bool,
     verbosity: int,
@@ -250,16 +344,18 @@ def main(
 
     # Show version and exit
     if version:
-        console.print(f"DomainGenChecker v{__version__}")
+        click.echo(f"DomainGenChecker v{__version__}")
         return
 
+    from .config import Config, LogLevel, OutputFormat
+
     # Load configuration
     if config:
         try:
             app_config = Config.from_file(config)
-            console.print(f"[green]Loaded configuration from {config}[/green]")
+            _console().print(f"[green]Loaded configuration from {config}[/green]")
         except Exception as e:
-            console.print(f"[red]Error loading config file: {e}[/red]")
+            _console().print(f"[red]Error loading config file: {e}[/red]")
             sys.exit(1)
     else:
         app_config = Config()
@@ -292,33 +388,29 @@ def main(
 
     app_config.log_level = LogLevel(log_level)
     app_config.cache_results = not no_cache
+    app_config.persistent_cache = persistent_cache or app_config.persistent_cache
 
     # Set up logging
     app_config.setup_logging()
 
     # Get default TLD file if not provided
+    tld_file = tld_file or _default_tld_file()
     if not tld_file:
-        # Look for bundled TLD file in data directory
-        package_dir = Path(__file__).parent.parent.parent
-        default_tld_file = package_dir / "data" / "tlds-alpha-by-domain.txt"
-        if default_tld_file.exists():
-            tld_file = default_tld_file
-        else:
-            console.print(
-                "[red]Error: No TLD file specified and default not found[/red]"
-            )
-            console.print("[yellow]Please specify a TLD file with --tld-file[/yellow]")
-            sys.exit(1)
+        _console().print(
+            "[red]Error: No TLD file specified and default not found[/red]"
+        )
+        _console().print("[yellow]Please specify a TLD file with --tld-file[/yellow]")
+        sys.exit(1)
 
     # Validate input arguments
     if not domain and not file:
-        console.print("[red]Error: Must specify either --domain or --file[/red]")
-        console.print("[yellow]Use --help for usage information[/yellow]")
+        _console().print("[red]Error: Must specify either --domain or --file[/red]")
+        _console().print("[yellow]Use --help for usage information[/yellow]")
         sys.exit(1)
 
     if domain and file:
-        console.print("[red]Error: Cannot specify both --domain and --file[/red]")
-        console.print("[yellow]Use either --domain DOMAIN or --file FILE[/yellow]")
+        _console().print("[red]Error: Cannot specify both --domain and --file[/red]")
+        _console().print("[yellow]Use either --domain DOMAIN or --file FILE[/yellow]")
         sys.exit(1)
 
     # Run the main application
@@ -330,18 +422,29 @@ def main(
             input_source = str(file)
             input_mode = "file"
 
+        # Prefer uvloop's faster event loop when the optional extra is installed
+        try:
+            import uvloop
+
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+
         asyncio.run(run_domain_check(app_config, input_source, tld_file, input_mode))
     except KeyboardInterrupt:
-        console.print("\\n[yellow]Operation cancelled by user[/yellow]")
+        _console().print("\n[yellow]Operation cancelled by user[/yellow]")
         sys.exit(1)
     except Exception as e:
         logger.exception("Unexpected error in main application")
-        console.print(f"[red]Unexpected error: {e}[/red]")
+        _console().print(f"[red]Unexpected error: {e}[/red]")
         sys.exit(1)
 
 
 async def run_domain_check(
-    config: Config, input_source: str, tld_file: Path, input_mode: Optional[str] = None
+    config: "Config",
+    input_source: str,
+    tld_file: Path,
+    input_mode: Optional[str] = None,
 ) -> None:
     """Run the main domain checking logic.
 
@@ -351,6 +454,10 @@ async def run_domain_check(
         tld_file: Path to TLD file
         input_mode: Force input mode: 'domain' or 'file', or None for auto-detection
     """
+    from .dns_checker import DNSChecker, PersistentDNSCache
+    from .domain_generator import DomainGenerator
+    from .output_handler import OutputHandler
+
     # Initialize components
     output_handler = OutputHandler(config.output)
 
@@ -377,48 +484,134 @@ async def run_domain_check(
         output_handler.display_error(f"Error processing input: {e}")
         return
 
-    valid_tlds = load_tlds(tld_file, config.generator.max_tld_length)
+    dns_checker = DNSChecker(config.dns)
+
+    # Load TLDs (disk) in a worker thread while the DNS health check (network)
+    # runs, so setup costs the slower of the two rather than their sum
+    loop = asyncio.get_running_loop()
+    tlds_future = loop.run_in_executor(
+        None, load_tlds, tld_file, config.generator.max_tld_length
+    )
+
+    # Health check DNS resolver; single-domain and other small runs skip it
+    # because their first real query doubles as the probe
+    max_variations = len(input_domains) * config.generator.max_variants_per_domain
+    if (
+        config.dns.health_check_enabled
+        and input_mode != "domain"
+        and max_variations > _HEALTH_CHECK_MIN_VARIATIONS
+    ):
+        valid_tlds, healthy = await asyncio.gather(
+            tlds_future, dns_checker.health_check()
+        )
+        if not healthy:
+            output_handler.display_warning("DNS health check failed, but continuing...")
+    else:
+        valid_tlds = await tlds_future
+
     if not valid_tlds:
         output_handler.display_error("No valid TLDs loaded")
         return
 
-    # Initialize domain generator and DNS checker
+    # Initialize domain generator
     domain_generator = DomainGenerator(config.generator, valid_tlds)
-    dns_checker = DNSChecker(config.dns)
-
-    # Health check DNS resolver
-    if not await dns_checker.health_check():
-        output_handler.display_warning("DNS health check failed, but continuing...")
 
-    # Generate domain variations
+    # Generate domain variations lazily; only one batch is resident at a time
     output_handler.display_info("Generating domain variations...")
-    all_variations = list(domain_generator.generate_variations(input_domains))
-
-    if not all_variations:
+    # Large domain files are spread over one generation process per core
+    workers = (os.cpu_count() or 1) if input_mode == "file" else 1
+    variations = domain_generator.generate_variations(input_domains, workers)
+
+    # Process domains in batches for better memory usage; the size adapts to
+    # observed batch latency below. Generation is CPU-bound (and may wait on
+    # worker processes), so batches are pulled in a thread to keep DNS
+    # lookups in flight on the event loop meanwhile
+    batch_size = _INITIAL_BATCH_SIZE
+    batch = await loop.run_in_executor(None, _take, variations, batch_size)
+
+    if not batch:
         output_handler.display_error("No domain variations generated")
         return
 
+    # The exact count is unknown until the generator is exhausted, so the
+    # summary and progress bar are sized with the upper bound
     # Display summary
-    output_handler.display_summary_header(len(input_domains), len(all_variations))
+    output_handler.display_summary_header(len(input_domains), max_variations)
 
-    # Check DNS resolution for all variations
-    progress = output_handler.display_progress(len(all_variations))
+    # Serve repeat lookups from the on-disk cache when enabled
+    disk_cache: Optional["PersistentDNSCache"] = None
+    if config.cache_results and config.persistent_cache:
+        try:
+            disk_cache = PersistentDNSCache(
+                config.cache_file,
+                resolver=_resolver_key(config.dns.nameservers),
+                ttl=config.cache_ttl,
+            )
+        except (OSError, sqlite3.Error) as e:
+            output_handler.display_warning(
+                f"Persistent DNS cache unavailable ({e}), continuing without it"
+            )
 
-    with progress:
-        task = progress.add_task(
-            "Checking DNS resolution...", total=len(all_variations)
-        )
+    # Check DNS resolution for all variations
+    progress = output_handler.display_progress(max_variations)
 
-        # Process domains in batches for better memory usage
-        batch_size = min(1000, len(all_variations))
+    # Keep up to two batches in flight so the DNS checker is not left idle
+    # while the previous batch's results are collected
+    inflight: Deque[Tuple["asyncio.Task[List[DNSResult]]", float]] = deque()
 
-        for i in range(0, len(all_variations), batch_size):
-            batch = all_variations[i : i + batch_size]
-            results = await dns_checker.check_domains(
-                batch, use_cache=config.cache_results
-            )
-            output_handler.add_results(results)
-            progress.update(task, advance=len(batch))
+    try:
+        with progress:
+            task = progress.add_task("Checking DNS resolution...", total=max_variations)
+            checked = 0
+
+            # Coalesce progress updates to limit Rich re-rendering on large runs
+            reported = 0
+            last_report = time.monotonic()
+            report_step = max(1, max_variations // 100)
+
+            while batch or inflight:
+                if batch:
+                    batch_task = asyncio.ensure_future(
+                        _check_batch(
+                            dns_checker, batch, config.cache_results, disk_cache
+                        )
+                    )
+                    inflight.append((batch_task, time.monotonic()))
+                    batch = await loop.run_in_executor(
+                        None, _take, variations, batch_size
+                    )
+
+                if len(inflight) >= _MAX_INFLIGHT_BATCHES or (inflight and not batch):
+                    batch_task, started = inflight.popleft()
+                    results = await batch_task
+                    output_handler.add_results(results)
+                    checked += len(results)
+
+                    # Grow fast batches to cut per-batch overhead and shrink slow
+                    # ones to keep output and progress responsive
+                    now = time.monotonic()
+                    elapsed = now - started
+                    if elapsed < _FAST_BATCH_SECONDS and batch_size < _MAX_BATCH_SIZE:
+                        batch_size = min(batch_size * 2, _MAX_BATCH_SIZE)
+                    elif elapsed > _SLOW_BATCH_SECONDS and batch_size > _MIN_BATCH_SIZE:
+                        batch_size = max(batch_size // 2, _MIN_BATCH_SIZE)
+
+                    if (
+                        checked - reported >= report_step
+                        or now - last_report > _PROGRESS_INTERVAL
+                    ):
+                        progress.update(task, completed=checked)
+                        reported = checked
+                        last_report = now
+
+            progress.update(task, completed=checked, total=checked)
+    finally:
+        # Batches left in flight by an error or interrupt must not write to
+        # the disk cache after it is closed
+        for batch_task, _ in inflight:
+            batch_task.cancel()
+        if disk_cache is not None:
+            disk_cache.close()
 
     # Generate final output
     output_handler.generate_output()
@@ -429,5 +622,53 @@ async def run_domain_check(
         output_handler.display_info(f"DNS Cache: {dns_stats['cache_size']} entries")
 
 
+def _take(variations: Iterator[str], count: int) -> List[str]:
+    """Take up to count variations from the generator as a list."""
+    return list(islice(variations, count))
+
+
+def _resolver_key(nameservers: Optional[List[str]]) -> str:
+    """Key persistent cache entries by the resolvers that answered them.
+
+    Args:
+        nameservers: Custom nameservers, or None for the system resolver
+
+    Returns:
+        Comma-separated nameservers, or "system"
+    """
+    return ",".join(nameservers) if nameservers else "system"
+
+
+async def _check_batch(
+    dns_checker: "DNSChecker",
+    batch: List[str],
+    use_cache: bool,
+    disk_cache: Optional["PersistentDNSCache"],
+) -> List["DNSResult"]:
+    """Check a batch of domains, skipping those answered by the on-disk cache.
+
+    Args:
+        dns_checker: DNS checker used for cache misses
+        batch: Domains to check
+        use_cache: Whether to use the in-memory DNS cache
+        disk_cache: Optional persistent cache
+
+    Returns:
+        DNS results in the same order as ``batch``
+    """
+    if disk_cache is None:
+        return await dns_checker.check_domains(batch, use_cache=use_cache)
+
+    cached = disk_cache.get_many(batch)
+    misses = [domain for domain in batch if domain not in cached]
+    fresh: List["DNSResult"] = []
+    if misses:
+        fresh = await dns_checker.check_domains(misses, use_cache=use_cache)
+        disk_cache.set_many(fresh)
+
+    fresh_results = iter(fresh)
+    return [cached[d] if d in cached else next(fresh_results) for d in batch]
+
+
 if __name__ == "__main__":
     main()
@@ -7,7 +7,7 @@ from enum import Enum
 from pathlib import Path
 from typing import List, Optional, Set
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 
 
 class OutputFormat(str, Enum):
@@ -45,8 +45,12 @@ class DNSConfig(BaseModel):
         default=None, description="Custom DNS nameservers"
     )
     use_doh: bool = Field(default=False, description="Use DNS over HTTPS")
+    health_check_enabled: bool = Field(
+        default=True, description="Probe the resolver before larger runs"
+    )
 
-    @validator("nameservers")
+    @field_validator("nameservers")
+    @classmethod
     def validate_nameservers(cls, v: Optional[List[str]]) -> Optional[List[str]]:
         if v is not None:
             # Basic IP validation - could be enhanced
@@ -91,7 +95,8 @@ class GeneratorConfig(BaseModel):
     )
     custom_tlds: Optional[Set[str]] = Field(default=None, description="Custom TLD list")
 
-    @validator("custom_tlds")
+    @field_validator("custom_tlds")
+    @classmethod
     def validate_tlds(cls, v: Optional[Set[str]]) -> Optional[Set[str]]:
         if v is not None:
             # Ensure TLDs are lowercase and valid format
@@ -114,6 +119,11 @@ class OutputConfig(BaseModel):
     colorize: bool = Field(default=True, description="Colorize console output")
 
 
+def _default_cache_file() -> Path:
+    """Default location of the persistent DNS cache."""
+    return Path.home() / ".cache" / "domaingenchecker" / "dns.sqlite"
+
+
 class Config(BaseModel):
     """Main configuration class."""
 
@@ -125,26 +135,32 @@ class Config(BaseModel):
     log_level: LogLevel = Field(default=LogLevel.INFO, description="Logging level")
     cache_results: bool = Field(default=True, description="Enable result caching")
     cache_ttl: int = Field(default=3600, ge=60, description="Cache TTL in seconds")
+    persistent_cache: bool = Field(
+        default=False, description="Persist DNS results on disk between runs"
+    )
+    cache_file: Path = Field(
+        default_factory=_default_cache_file, description="Persistent DNS cache file"
+    )
 
     @classmethod
     def from_file(cls, config_path: Path) -> "Config":
         """Load configuration from file."""
         if config_path.suffix.lower() == ".json":
-            import json
-
-            with open(config_path, "r") as f:
-                data = json.load(f)
-            return cls(**data)
+            # pydantic-core parses and validates the raw bytes in one pass
+            return cls.model_validate_json(config_path.read_bytes())
         else:
             raise ValueError(f"Unsupported config file format: {config_path.suffix}")
 
     def to_file(self, config_path: Path) -> None:
-        """Save configuration to file."""
-        if config_path.suffix.lower() == ".json":
-            import json
+        """Save configuration to file.
 
-            with open(config_path, "w") as f:
-                json.dump(self.dict(), f, indent=2, default=str)
+        Only settings that differ from their defaults are written, so saved
+        files pick up future default changes.
+        """
+        if config_path.suffix.lower() == ".json":
+            config_path.write_text(
+                self.model_dump_json(indent=2, exclude_defaults=True)
+            )
         else:
             raise ValueError(f"Unsupported config file format: {config_path.suffix}")
 
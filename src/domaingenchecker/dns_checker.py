@@ -3,20 +3,32 @@ Asynchronous DNS resolution checker with caching and rate limiting.
 """
 
 import asyncio
+import heapq
 import logging
+import sqlite3
+import sys
 import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import dns.asyncresolver
+import dns.exception
 import dns.resolver
-from asyncio_throttle import Throttler
 
 from .config import DNSConfig
 
 logger = logging.getLogger(__name__)
 
+# Record types collected by advanced checks; A and AAAA must come first
+_ADVANCED_RECORD_TYPES = ("A", "AAAA", "MX", "TXT", "NS", "CNAME")
+
+# dataclass(slots=True) is only available from Python 3.10
+_DATACLASS_OPTIONS: Dict[str, Any] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
 
 class DNSStatus(Enum):
     """DNS resolution status."""
@@ -27,9 +39,12 @@ class DNSStatus(Enum):
     TIMEOUT = "timeout"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DNSResult:
-    """DNS resolution result."""
+    """DNS resolution result.
+
+    Slotted on Python 3.10+ to keep large result lists compact.
+    """
 
     domain: str
     status: DNSStatus
@@ -37,31 +52,48 @@ class DNSResult:
     response_time: float
     error_message: Optional[str] = None
     timestamp: float = 0.0
+    records: Optional[Dict[str, List[str]]] = None
 
     def __post_init__(self) -> None:
         if self.timestamp == 0.0:
             self.timestamp = time.time()
 
 
+# A queued lookup: domain, whether to use the cache, and the future to resolve
+_WorkItem = Tuple[str, bool, "asyncio.Future[DNSResult]"]
+
+
 class DNSCache:
-    """Simple in-memory DNS cache with TTL support."""
+    """Simple in-memory DNS cache with TTL support.
+
+    Entries live in a single dict alongside a min-heap of expiry times, so
+    expired entries can be purged without scanning the whole cache.
+    """
 
-    def __init__(self, ttl: int = 3600):
+    # Number of insertions between opportunistic purges of expired entries
+    PURGE_INTERVAL = 1024
+
+    def __init__(self, ttl: int = 3600, negative_ttl: int = 300):
         """Initialize DNS cache.
 
         Args:
-            ttl: Time to live in seconds
+            ttl: Time to live in seconds for resolved domains
+            negative_ttl: Time to live in seconds for unresolved, failed and
+                timed out lookups
         """
         self.ttl = ttl
-        self._cache: Dict[str, DNSResult] = {}
-        self._timestamps: Dict[str, float] = {}
+        self.negative_ttl = negative_ttl
+        self._entries: Dict[str, Tuple[float, DNSResult]] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._inserts_since_purge = 0
 
     def get(self, domain: str) -> Optional[DNSResult]:
         """Get cached result for domain."""
-        if domain in self._cache:
-            if time.time() - self._timestamps[domain] < self.ttl:
+        entry = self._entries.get(domain)
+        if entry is not None:
+            if time.time() < entry[0]:
                 logger.debug(f"Cache hit for {domain}")
-                return self._cache[domain]
+                return entry[1]
             else:
                 # Expired entry
                 self._remove(domain)
@@ -69,23 +101,152 @@ class DNSCache:
 
     def set(self, domain: str, result: DNSResult) -> None:
         """Cache result for domain."""
-        self._cache[domain] = result
-        self._timestamps[domain] = time.time()
+        ttl = self.ttl if result.status is DNSStatus.RESOLVED else self.negative_ttl
+        expiry = time.time() + ttl
+        self._entries[domain] = (expiry, result)
+        heapq.heappush(self._heap, (expiry, domain))
         logger.debug(f"Cached result for {domain}")
 
+        self._inserts_since_purge += 1
+        if self._inserts_since_purge >= self.PURGE_INTERVAL:
+            self._purge_expired()
+
+    def _purge_expired(self) -> None:
+        """Drop entries whose expiry time has passed."""
+        now = time.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expiry, domain = heapq.heappop(heap)
+            entry = self._entries.get(domain)
+            # Heap items left behind by overwrites or removals are stale
+            if entry is not None and entry[0] == expiry:
+                del self._entries[domain]
+        self._inserts_since_purge = 0
+
     def _remove(self, domain: str) -> None:
         """Remove domain from cache."""
-        self._cache.pop(domain, None)
-        self._timestamps.pop(domain, None)
+        # The heap item is left in place and discarded lazily when purged
+        self._entries.pop(domain, None)
 
     def clear(self) -> None:
         """Clear all cached entries."""
-        self._cache.clear()
-        self._timestamps.clear()
+        self._entries.clear()
+        self._heap.clear()
+        self._inserts_since_purge = 0
 
     def size(self) -> int:
         """Get cache size."""
-        return len(self._cache)
+        return len(self._entries)
+
+
+class PersistentDNSCache:
+    """SQLite-backed DNS cache that survives between runs.
+
+    Only definitive answers are stored: resolved names, and unresolved names
+    whose lookups returned NXDOMAIN or an empty answer. Errors and timeouts
+    are transient and are always re-queried.
+
+    Entries are keyed by resolver as well as domain, since resolvers can
+    disagree (for example an internal or sinkholing resolver).
+    """
+
+    # SQLite's default limit on host parameters per statement
+    MAX_PARAMETERS = 999
+
+    def __init__(
+        self,
+        path: Path,
+        resolver: str = "system",
+        ttl: int = 3600,
+        negative_ttl: int = 86400,
+    ):
+        """Open (or create) the on-disk cache.
+
+        Args:
+            path: SQLite database file
+            resolver: Key of the resolver whose answers are read and stored
+            ttl: Time to live in seconds for resolved domains
+            negative_ttl: Time to live in seconds for unresolved domains
+        """
+        self.path = path
+        self.resolver = resolver
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        with self._conn:
+            # Entries of the old domain-only table cannot be attributed to a
+            # resolver, so that table is discarded
+            self._conn.execute("DROP TABLE IF EXISTS dns_cache")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dns_cache_v2 ("
+                "resolver TEXT NOT NULL, domain TEXT NOT NULL, "
+                "status TEXT NOT NULL, ip TEXT NOT NULL, expires REAL NOT NULL, "
+                "PRIMARY KEY (resolver, domain))"
+            )
+        logger.info(f"Opened persistent DNS cache at {path}")
+
+    def get_many(self, domains: Iterable[str]) -> Dict[str, DNSResult]:
+        """Get unexpired cached results for the given domains."""
+        now = time.time()
+        unique = list(dict.fromkeys(domains))
+        found: Dict[str, DNSResult] = {}
+
+        # Two parameters are taken by the resolver and expiry timestamp
+        chunk_size = self.MAX_PARAMETERS - 2
+        for i in range(0, len(unique), chunk_size):
+            chunk = unique[i : i + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                "SELECT domain, status, ip FROM dns_cache_v2 "
+                "WHERE resolver = ? AND expires > ? "
+                f"AND domain IN ({placeholders})",  # nosec B608
+                (self.resolver, now, *chunk),
+            )
+            for domain, status, ip in rows:
+                found[domain] = DNSResult(
+                    domain=domain,
+                    status=DNSStatus(status),
+                    ip_addresses=ip.split(",") if ip else [],
+                    response_time=0.0,
+                )
+
+        logger.debug(f"Persistent cache hits: {len(found)}/{len(unique)}")
+        return found
+
+    def set_many(self, results: Iterable[DNSResult]) -> None:
+        """Store definitive results."""
+        now = time.time()
+        resolved = DNSStatus.RESOLVED
+        unresolved = DNSStatus.UNRESOLVED
+        resolved_expiry = now + self.ttl
+        unresolved_expiry = now + self.negative_ttl
+        resolver = self.resolver
+        rows = [
+            (
+                resolver,
+                r.domain,
+                r.status.value,
+                ",".join(r.ip_addresses),
+                resolved_expiry if r.status is resolved else unresolved_expiry,
+            )
+            for r in results
+            if r.status is resolved or r.status is unresolved
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO dns_cache_v2 VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+    def clear(self) -> None:
+        """Clear all cached entries."""
+        with self._conn:
+            self._conn.execute("DELETE FROM dns_cache_v2")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
 
 
 class DNSChecker:
@@ -104,13 +265,25 @@ class DNSChecker:
         self.resolver = dns.asyncresolver.Resolver()
         self.resolver.timeout = config.timeout
         self.resolver.lifetime = config.timeout * config.retries
+        # Generated names are fully qualified; never expand the search list
+        self.resolver.use_search_by_default = False
 
         if config.nameservers:
             self.resolver.nameservers = config.nameservers
             logger.info(f"Using custom nameservers: {config.nameservers}")
 
-        # Rate limiting
-        self.throttler = Throttler(rate_limit=int(config.rate_limit))
+        # Rate limiting: a token bucket holding up to one second of queries
+        self._rate = config.rate_limit
+        self._bucket_size = max(1.0, config.rate_limit)
+        self._tokens = self._bucket_size
+        self._last_refill: Optional[float] = None
+
+        # Worker pool shared by all check_domains calls, so concurrent calls
+        # together never exceed concurrent_limit lookups; it is bound to the
+        # event loop it was started on
+        self._queue: Optional["asyncio.Queue[_WorkItem]"] = None
+        self._workers: List["asyncio.Future[None]"] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
         logger.info(
             f"Initialized DNSChecker with {config.concurrent_limit} concurrent limit"
@@ -130,52 +303,84 @@ class DNSChecker:
         """
         logger.info(f"Checking DNS for {len(domains)} domains")
 
-        # Create semaphore to limit concurrent connections
-        semaphore = asyncio.Semaphore(self.config.concurrent_limit)
-
-        # Prepare tasks
-        tasks = [
-            self._check_domain_with_semaphore(domain, semaphore, use_cache)
-            for domain in domains
-        ]
-
-        # Execute tasks concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Process results and handle exceptions
-        dns_results: List[DNSResult] = []
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"Unexpected error in DNS check: {result}")
-                # Create error result for failed task
-                dns_results.append(
-                    DNSResult(
-                        domain="unknown",
-                        status=DNSStatus.ERROR,
-                        ip_addresses=[],
-                        response_time=0.0,
-                        error_message=str(result),
-                    )
-                )
-            elif isinstance(result, DNSResult):
-                dns_results.append(result)
+        loop = asyncio.get_running_loop()
+        queue = self._worker_queue(loop)
+        results: List[Optional[DNSResult]] = [None] * len(domains)
+        pending: List[Tuple[int, "asyncio.Future[DNSResult]"]] = []
+
+        # Answer cache hits immediately; only misses are handed to workers
+        for index, domain in enumerate(domains):
+            if use_cache:
+                cached_result = self.cache.get(domain)
+                if cached_result:
+                    results[index] = cached_result
+                    continue
+            future: "asyncio.Future[DNSResult]" = loop.create_future()
+            queue.put_nowait((domain, use_cache, future))
+            pending.append((index, future))
+
+        # A fixed pool of workers bounds concurrency without one task (and one
+        # semaphore acquisition) per domain
+        new_workers = min(
+            self.config.concurrent_limit - len(self._workers), queue.qsize()
+        )
+        for _ in range(new_workers):
+            self._workers.append(asyncio.ensure_future(self._worker(queue)))
 
+        try:
+            for index, future in pending:
+                results[index] = await future
+        except BaseException:
+            # Drop this call's queued domains if it is cancelled
+            for _, future in pending:
+                future.cancel()
+            raise
+
+        dns_results = [result for result in results if result is not None]
         logger.info(f"Completed DNS checks: {len(dns_results)} results")
         return dns_results
 
-    async def _check_domain_with_semaphore(
-        self, domain: str, semaphore: asyncio.Semaphore, use_cache: bool
-    ) -> DNSResult:
-        """Check single domain with semaphore for concurrency control."""
-        async with semaphore:
-            return await self.check_domain(domain, use_cache)
+    def _worker_queue(
+        self, loop: asyncio.AbstractEventLoop
+    ) -> "asyncio.Queue[_WorkItem]":
+        """Return the shared work queue, starting afresh on a new event loop."""
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._workers = []
+            self._loop = loop
+        return self._queue
+
+    async def _worker(self, queue: "asyncio.Queue[_WorkItem]") -> None:
+        """Check queued domains until cancelled, resolving each item's future."""
+        while True:
+            domain, use_cache, future = await queue.get()
+            if future.cancelled():
+                continue
+            try:
+                result = await self.check_domain(domain, use_cache)
+            except Exception as e:
+                logger.error(f"Unexpected error in DNS check: {e}")
+                # Create error result for failed check
+                result = DNSResult(
+                    domain=domain,
+                    status=DNSStatus.ERROR,
+                    ip_addresses=[],
+                    response_time=0.0,
+                    error_message=str(e),
+                )
+            if not future.cancelled():
+                future.set_result(result)
 
-    async def check_domain(self, domain: str, use_cache: bool = True) -> DNSResult:
+    async def check_domain(
+        self, domain: str, use_cache: bool = True, full: bool = False
+    ) -> DNSResult:
         """Check DNS resolution for a single domain.
 
         Args:
             domain: Domain to check
             use_cache: Whether to use cached results
+            full: Also collect every advanced record type into the result's
+                records, in the same round trip as the address lookup
 
         Returns:
             DNS result
@@ -183,42 +388,49 @@ class DNSChecker:
         # Check cache first
         if use_cache:
             cached_result = self.cache.get(domain)
-            if cached_result:
+            if cached_result and (not full or cached_result.records is not None):
                 return cached_result
 
         # Rate limiting
-        async with self.throttler:
-            start_time = time.time()
+        await self._acquire_token()
+        start_time = time.time()
 
-            try:
-                # Perform DNS lookup
+        try:
+            # Perform DNS lookup
+            records = None
+            if full:
+                answers = await self._query_advanced(domain)
+                records = self._records_by_type(domain, answers)
+                result = self._address_records(domain, answers[0], answers[1])
+            else:
                 result = await self._resolve_domain(domain)
-                response_time = time.time() - start_time
-
-                dns_result = DNSResult(
-                    domain=domain,
-                    status=DNSStatus.RESOLVED if result else DNSStatus.UNRESOLVED,
-                    ip_addresses=result,
-                    response_time=response_time,
-                )
-
-            except asyncio.TimeoutError:
-                dns_result = DNSResult(
-                    domain=domain,
-                    status=DNSStatus.TIMEOUT,
-                    ip_addresses=[],
-                    response_time=time.time() - start_time,
-                    error_message="DNS query timeout",
-                )
+            response_time = time.time() - start_time
+
+            dns_result = DNSResult(
+                domain=domain,
+                status=DNSStatus.RESOLVED if result else DNSStatus.UNRESOLVED,
+                ip_addresses=result,
+                response_time=response_time,
+                records=records,
+            )
+
+        except (asyncio.TimeoutError, dns.exception.Timeout):
+            dns_result = DNSResult(
+                domain=domain,
+                status=DNSStatus.TIMEOUT,
+                ip_addresses=[],
+                response_time=time.time() - start_time,
+                error_message="DNS query timeout",
+            )
 
-            except Exception as e:
-                dns_result = DNSResult(
-                    domain=domain,
-                    status=DNSStatus.ERROR,
-                    ip_addresses=[],
-                    response_time=time.time() - start_time,
-                    error_message=str(e),
-                )
+        except Exception as e:
+            dns_result = DNSResult(
+                domain=domain,
+                status=DNSStatus.ERROR,
+                ip_addresses=[],
+                response_time=time.time() - start_time,
+                error_message=str(e),
+            )
 
         # Cache the result
         if use_cache:
@@ -229,6 +441,25 @@ class DNSChecker:
         )
         return dns_result
 
+    async def _acquire_token(self) -> None:
+        """Wait until the rate limit allows another query.
+
+        Each caller takes a token immediately, letting the balance go negative,
+        and then sleeps until its token would have been refilled. The update
+        has no await in between, so no lock is needed on the event loop.
+        """
+        now = asyncio.get_running_loop().time()
+        if self._last_refill is not None:
+            self._tokens = min(
+                self._bucket_size,
+                self._tokens + (now - self._last_refill) * self._rate,
+            )
+        self._last_refill = now
+
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self._rate)
+
     async def _resolve_domain(self, domain: str) -> List[str]:
         """Resolve domain to IP addresses.
 
@@ -237,55 +468,131 @@ class DNSChecker:
 
         Returns:
             List of IP addresses
+
+        Raises:
+            dns.exception.DNSException: If the lookup failed without a
+                definitive answer
         """
-        ip_addresses = []
+        # Query A and AAAA concurrently rather than waiting for A to fail
+        a_answer, aaaa_answer = await asyncio.gather(
+            self._query(domain, "A"),
+            self._query(domain, "AAAA"),
+            return_exceptions=True,
+        )
 
-        # Try A records first
-        try:
-            answers = await self.resolver.resolve(domain, "A")
-            ip_addresses.extend([str(rdata) for rdata in answers])
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.Timeout):
-            # These are expected DNS resolution failures, continue to IPv6 attempt
-            pass
-        except Exception as e:
-            logger.debug(f"Error resolving A record for {domain}: {e}")
+        return self._address_records(domain, a_answer, aaaa_answer)
 
-        # Try AAAA records (IPv6) if no A records found
-        if not ip_addresses:
-            try:
-                answers = await self.resolver.resolve(domain, "AAAA")
-                ip_addresses.extend([str(rdata) for rdata in answers])
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.Timeout):
-                # Expected DNS resolution failures for IPv6, no action needed
-                pass
-            except Exception as e:
-                logger.debug(f"Error resolving AAAA record for {domain}: {e}")
+    def _address_records(
+        self,
+        domain: str,
+        a_answer: Union[dns.resolver.Answer, BaseException],
+        aaaa_answer: Union[dns.resolver.Answer, BaseException],
+    ) -> List[str]:
+        """Pick the addresses of a domain from its gathered A and AAAA outcomes.
+
+        An empty list is only returned for a definitive negative answer
+        (NXDOMAIN, or empty answers for both types), so that it can be cached
+        as unresolved.
 
-        return ip_addresses
+        Args:
+            domain: Domain that was queried
+            a_answer: A answer, or the exception raised by the query
+            aaaa_answer: AAAA answer, or the exception raised by the query
+
+        Returns:
+            List of IP addresses
+
+        Raises:
+            BaseException: The failure of a query, when no addresses were found
+                and the name was not reported as nonexistent
+        """
+        # Prefer IPv4 addresses, falling back to IPv6 if no A records found
+        addresses = self._answer_records(domain, "A", a_answer) or self._answer_records(
+            domain, "AAAA", aaaa_answer
+        )
+        if addresses:
+            return addresses
+
+        answers = (a_answer, aaaa_answer)
+        if any(isinstance(answer, dns.resolver.NXDOMAIN) for answer in answers):
+            return []
+        for answer in answers:
+            if isinstance(answer, BaseException):
+                raise answer
+        return []
+
+    async def _query(self, domain: str, record_type: str) -> dns.resolver.Answer:
+        """Query one record type without search-list expansion.
+
+        A name without records of the type comes back as an empty answer
+        instead of raising NoAnswer.
+        """
+        return await self.resolver.resolve(
+            domain, record_type, search=False, raise_on_no_answer=False
+        )
+
+    def _answer_records(
+        self,
+        domain: str,
+        record_type: str,
+        answer: Union[dns.resolver.Answer, BaseException],
+    ) -> List[str]:
+        """Extract record values from a gathered resolve() outcome.
+
+        Args:
+            domain: Domain that was queried
+            record_type: Record type that was queried
+            answer: Answer, or the exception raised by the query
+
+        Returns:
+            List of record values (empty on failure)
+        """
+        if isinstance(
+            answer, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.Timeout)
+        ):
+            # These are expected DNS resolution failures
+            return []
+        if isinstance(answer, BaseException):
+            logger.debug(f"Error resolving {record_type} record for {domain}: {answer}")
+            return []
+        if answer.rrset is None:
+            return []
+        return [str(rdata) for rdata in answer.rrset]
 
     async def check_domain_advanced(self, domain: str) -> Dict[str, List[str]]:
         """Perform advanced DNS checks for multiple record types.
 
+        All record types are queried concurrently.
+
         Args:
             domain: Domain to check
 
         Returns:
             Dictionary of record types and their values
         """
-        record_types = ["A", "AAAA", "MX", "TXT", "NS", "CNAME"]
-        results = {}
+        return self._records_by_type(domain, await self._query_advanced(domain))
 
-        for record_type in record_types:
-            try:
-                answers = await self.resolver.resolve(domain, record_type)
-                results[record_type] = [str(rdata) for rdata in answers]
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.Timeout):
-                results[record_type] = []
-            except Exception as e:
-                logger.debug(f"Error resolving {record_type} record for {domain}: {e}")
-                results[record_type] = []
+    async def _query_advanced(
+        self, domain: str
+    ) -> List[Union[dns.resolver.Answer, BaseException]]:
+        """Query every advanced record type concurrently.
 
-        return results
+        Returns:
+            Answers (or raised exceptions) in _ADVANCED_RECORD_TYPES order
+        """
+        return await asyncio.gather(
+            *(self._query(domain, rt) for rt in _ADVANCED_RECORD_TYPES),
+            return_exceptions=True,
+        )
+
+    def _records_by_type(
+        self, domain: str, answers: List[Union[dns.resolver.Answer, BaseException]]
+    ) -> Dict[str, List[str]]:
+        """Map gathered advanced answers to record values by record type."""
+        return {
+            record_type: self._answer_records(domain, record_type, answer)
+            for record_type, answer in zip(_ADVANCED_RECORD_TYPES, answers)
+        }
 
     def get_statistics(self) -> Dict[str, int]:
         """Get DNS checker statistics.
@@ -296,6 +603,7 @@ class DNSChecker:
         return {
             "cache_size": self.cache.size(),
             "cache_ttl": self.cache.ttl,
+            "cache_negative_ttl": self.cache.negative_ttl,
             "concurrent_limit": self.config.concurrent_limit,
             "timeout": int(self.config.timeout),
             "retries": self.config.retries,
@@ -2,10 +2,26 @@
 Advanced domain name variation generator for typosquatting detection.
 """
 
+import functools
 import logging
-import secrets
+import random
+import re
 import string
-from typing import Generator, List, Set
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    AbstractSet,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 from urllib.parse import urlparse
 
 import tldextract
@@ -14,6 +30,39 @@ from .config import GeneratorConfig
 
 logger = logging.getLogger(__name__)
 
+# Minimum number of input domains before generation uses a process pool.
+# Serial generation costs about 0.4ms per domain at the default variant cap
+# (about 1.2ms at the maximum cap), while starting a worker and building its
+# generator costs about 50ms, so smaller inputs finish sooner serially.
+PARALLEL_MIN_DOMAINS = 1000
+
+# Number of input domains handed to a worker process per task
+_PARALLEL_CHUNK_SIZE = 50
+
+# TLDs always tried for every variant, when available
+_COMMON_TLDS = ("com", "net", "org", "info", "biz")
+
+# Number of additional TLDs sampled for diversity, and the seed used to pick them
+_RANDOM_TLD_COUNT = 10
+_RANDOM_TLD_SEED = 42
+
+# Number of parsed input domains memoized per generator
+_EXTRACT_CACHE_SIZE = 1024
+
+# Replacement characters tried at each position by character substitution
+_SUB_CHARS = tuple(string.ascii_lowercase)
+_SUB_BYTES = string.ascii_lowercase.encode("ascii")
+
+# Dot-separated labels of 1-63 ASCII alphanumerics, hyphens or non-ASCII
+# characters (for IDN), without leading or trailing hyphens; at least two labels
+_LABEL_CHAR = "A-Za-z0-9\u0080-\U0010ffff"
+_LABEL = f"[{_LABEL_CHAR}](?:[{_LABEL_CHAR}-]{{0,61}}[{_LABEL_CHAR}])?"
+_DOMAIN_RE = re.compile(rf"(?:{_LABEL}\.)+{_LABEL}")
+
+# The same rules restricted to ASCII, for names without IDN characters
+_ASCII_LABEL = "[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?"
+_ASCII_DOMAIN_RE = re.compile(rf"(?:{_ASCII_LABEL}\.)+{_ASCII_LABEL}")
+
 
 class DomainGenerator:
     """Advanced domain variation generator using multiple typosquatting techniques."""
@@ -78,7 +127,7 @@ class DomainGenerator:
     }
 
     # Common subdomain prefixes for variations
-    SUBDOMAIN_PREFIXES = [
+    SUBDOMAIN_PREFIXES = (
         "www",
         "mail",
         "email",
@@ -110,9 +159,9 @@ class DomainGenerator:
         "apps",
         "download",
         "updates",
-    ]
+    )
 
-    def __init__(self, config: GeneratorConfig, tlds: Set[str]):
+    def __init__(self, config: GeneratorConfig, tlds: AbstractSet[str]):
         """Initialize the domain generator.
 
         Args:
@@ -121,19 +170,95 @@ class DomainGenerator:
         """
         self.config = config
         self.tlds = tlds
+        self._common_tlds = tuple(
+            tld
+            for tld in _COMMON_TLDS
+            if tld in tlds and len(tld) <= config.max_tld_length
+        )
+
+        # Sample the diversity TLDs once, from a fixed seed, so repeated runs
+        # generate the same variations (and hit the same cache entries)
+        available_tlds = sorted(
+            tld for tld in tlds if len(tld) <= config.max_tld_length
+        )
+        sample_size = min(_RANDOM_TLD_COUNT, len(available_tlds))
+        rng = random.Random(_RANDOM_TLD_SEED)  # nosec B311 - not security sensitive
+        self._random_tlds = tuple(rng.sample(available_tlds, sample_size))
+        self._relevant_tlds: Dict[str, Tuple[str, ...]] = {}
+
+        # Use the bundled public suffix list snapshot: no network fetch and no
+        # disk cache, with parsed results memoized per input domain
+        extractor = tldextract.TLDExtract(
+            cache_dir=None, suffix_list_urls=(), fallback_to_snapshot=True
+        )
+        self._extract = functools.lru_cache(maxsize=_EXTRACT_CACHE_SIZE)(extractor)
         logger.info(f"Initialized DomainGenerator with {len(tlds)} TLDs")
 
-    def generate_variations(self, domains: List[str]) -> Generator[str, None, None]:
+    def generate_variations(
+        self, domains: List[str], workers: int = 1
+    ) -> Generator[str, None, None]:
         """Generate domain variations for a list of input domains.
 
+        Variations shared by several input domains are only yielded once.
+
         Args:
             domains: List of input domains
+            workers: Number of worker processes; large inputs are spread over
+                a process pool when greater than 1
 
         Yields:
             Generated domain variations
         """
-        for domain in domains:
-            yield from self.generate_domain_variations(domain)
+        variations: Iterable[str]
+        if workers > 1 and len(domains) >= PARALLEL_MIN_DOMAINS:
+            variations = self._generate_variations_parallel(domains, workers)
+        else:
+            variations = (
+                variation
+                for domain in domains
+                for variation in self.generate_domain_variations(domain)
+            )
+
+        seen: Set[str] = set()
+        for variation in variations:
+            if variation not in seen:
+                seen.add(variation)
+                yield variation
+
+    def _generate_variations_parallel(
+        self, domains: List[str], workers: int
+    ) -> Generator[str, None, None]:
+        """Generate variations in a process pool, preserving input order.
+
+        At most two chunks per worker are submitted ahead of the consumer, so
+        memory stays bounded by the chunks in flight rather than the input.
+        """
+        chunks = [
+            domains[i : i + _PARALLEL_CHUNK_SIZE]
+            for i in range(0, len(domains), _PARALLEL_CHUNK_SIZE)
+        ]
+        # Every worker builds its own generator on start, so never start more
+        # workers than there are chunks
+        workers = min(workers, len(chunks))
+        logger.info(
+            f"Generating variations for {len(domains)} domains "
+            f"with {workers} worker processes"
+        )
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.config, self.tlds),
+        ) as pool:
+            pending: Deque["Future[List[str]]"] = deque()
+            remaining = iter(chunks)
+            for chunk in islice(remaining, 2 * workers):
+                pending.append(pool.submit(_generate_chunk, chunk))
+
+            while pending:
+                chunk_variations = pending.popleft().result()
+                for chunk in islice(remaining, 1):
+                    pending.append(pool.submit(_generate_chunk, chunk))
+                yield from chunk_variations
 
     def generate_domain_variations(self, domain: str) -> Generator[str, None, None]:
         """Generate variations for a single domain.
@@ -146,7 +271,7 @@ class DomainGenerator:
         """
         # Parse the domain
         domain = self._clean_domain(domain)
-        extracted = tldextract.extract(domain)
+        extracted = self._extract(domain)
 
         if not extracted.domain:
             logger.warning(f"Could not extract domain from: {domain}")
@@ -157,11 +282,25 @@ class DomainGenerator:
 
         logger.debug(f"Generating variations for: {base_domain}.{original_tld}")
 
-        # Keep track of generated domains to avoid duplicates
-        seen_domains = set()
+        # Select TLDs once per input domain rather than once per variant
+        relevant_tlds = self._get_relevant_tlds(original_tld)
+        variants = self._stream_variants(base_domain)
+
         variation_count = 0
+        for full_domain in islice(
+            self._with_tlds(variants, relevant_tlds, domain),
+            self.config.max_variants_per_domain,
+        ):
+            variation_count += 1
+            yield full_domain
+
+        logger.debug(f"Generated {variation_count} variations for {domain}")
 
-        # Generate variations using different techniques
+    def _stream_variants(self, base_domain: str) -> Generator[str, None, None]:
+        """Chain the variants of every enabled technique for a base domain.
+
+        A failing technique is logged and skipped.
+        """
         techniques = [
             (self.config.enable_character_omission, self._generate_omission_variants),
             (
@@ -182,36 +321,41 @@ class DomainGenerator:
         ]
 
         for enabled, technique_func in techniques:
-            if not enabled or variation_count >= self.config.max_variants_per_domain:
+            if not enabled:
                 continue
 
             try:
-                for variant_domain in technique_func(base_domain):
-                    if variation_count >= self.config.max_variants_per_domain:
-                        break
-
-                    # Generate with different TLD combinations
-                    for tld in self._get_relevant_tlds(original_tld):
-                        full_domain = f"{variant_domain}.{tld}"
-
-                        if (
-                            full_domain not in seen_domains
-                            and self._is_valid_domain_name(full_domain)
-                            and full_domain != domain
-                        ):
-
-                            seen_domains.add(full_domain)
-                            variation_count += 1
-                            yield full_domain
-
-                            if variation_count >= self.config.max_variants_per_domain:
-                                break
-
+                yield from technique_func(base_domain)
             except Exception as e:
                 logger.error(f"Error in technique {technique_func.__name__}: {e}")
+
+    def _with_tlds(
+        self, variants: Iterable[str], tlds: Sequence[str], domain: str
+    ) -> Generator[str, None, None]:
+        """Combine unique base variants with each TLD into valid full domains.
+
+        The TLD list is fixed for an input domain, so tracking base variants is
+        enough to keep the generated full domains unique.
+        """
+        seen_variants: Set[str] = set()
+        ascii_tlds = all(tld.isascii() for tld in tlds)
+        is_valid_ascii = self._is_valid_ascii_domain
+        is_valid_idn = self._is_valid_idn_domain
+        for variant_domain in variants:
+            if variant_domain in seen_variants:
                 continue
+            seen_variants.add(variant_domain)
 
-        logger.debug(f"Generated {variation_count} variations for {domain}")
+            # Only variants with non-ASCII characters need the IDN-aware check
+            if ascii_tlds and variant_domain.isascii():
+                is_valid = is_valid_ascii
+            else:
+                is_valid = is_valid_idn
+
+            for tld in tlds:
+                full_domain = f"{variant_domain}.{tld}"
+                if full_domain != domain and is_valid(full_domain):
+                    yield full_domain
 
     def _clean_domain(self, domain: str) -> str:
         """Clean and normalize domain input."""
@@ -229,32 +373,17 @@ class DomainGenerator:
 
         return domain
 
-    def _get_relevant_tlds(self, original_tld: str) -> List[str]:
+    def _get_relevant_tlds(self, original_tld: str) -> Tuple[str, ...]:
         """Get relevant TLDs for variations."""
-        relevant_tlds = []
-
-        # Always include original TLD
-        if original_tld and original_tld in self.tlds:
-            relevant_tlds.append(original_tld)
-
-        # Add common TLDs
-        common_tlds = {"com", "net", "org", "info", "biz"}
-        for tld in common_tlds:
-            if tld in self.tlds and len(tld) <= self.config.max_tld_length:
-                relevant_tlds.append(tld)
-
-        # Add some random TLDs for diversity using cryptographically secure random
-        available_tlds = [
-            tld for tld in self.tlds if len(tld) <= self.config.max_tld_length
-        ]
-        # Use secrets.SystemRandom for cryptographically secure sampling
-        secure_random = secrets.SystemRandom()
-        sample_size = min(10, len(available_tlds))
-        if sample_size > 0:
-            random_tlds = secure_random.sample(available_tlds, sample_size)
-            relevant_tlds.extend(random_tlds)
-
-        return list(set(relevant_tlds))  # Remove duplicates
+        relevant_tlds = self._relevant_tlds.get(original_tld)
+        if relevant_tlds is None:
+            # Always include original TLD, then common and sampled TLDs
+            leading = (original_tld,) if original_tld in self.tlds else ()
+            relevant_tlds = tuple(
+                dict.fromkeys((*leading, *self._common_tlds, *self._random_tlds))
+            )
+            self._relevant_tlds[original_tld] = relevant_tlds
+        return relevant_tlds
 
     def _generate_omission_variants(self, domain: str) -> Generator[str, None, None]:
         """Generate variants by omitting characters."""
@@ -279,33 +408,58 @@ class DomainGenerator:
         self, domain: str
     ) -> Generator[str, None, None]:
         """Generate variants by substituting characters."""
-        for i in range(len(domain)):
-            char = domain[i]
-            for replacement in string.ascii_lowercase:
-                if replacement != char:
-                    variant = domain[:i] + replacement + domain[i + 1 :]
-                    yield variant
+        if not domain.isascii():
+            for i in range(len(domain)):
+                char = domain[i]
+                for letter in _SUB_CHARS:
+                    if letter != char:
+                        yield domain[:i] + letter + domain[i + 1 :]
+            return
+
+        # Mutate one byte in place instead of slicing and concatenating
+        buf = bytearray(domain, "ascii")
+        for i in range(len(buf)):
+            original = buf[i]
+            for replacement in _SUB_BYTES:
+                if replacement != original:
+                    buf[i] = replacement
+                    yield buf.decode("ascii")
+            buf[i] = original
 
     def _generate_keyboard_variants(self, domain: str) -> Generator[str, None, None]:
         """Generate variants based on keyboard proximity."""
+        kb_adj = _KB_ADJ
+        buf = bytearray(domain, "ascii") if domain.isascii() else None
         for i, char in enumerate(domain):
-            if char in self.KEYBOARD_LAYOUT:
-                for adjacent_char in self.KEYBOARD_LAYOUT[char]:
-                    variant = domain[:i] + adjacent_char + domain[i + 1 :]
-                    yield variant
+            code = ord(char)
+            adjacent = kb_adj[code] if code < 128 else None
+            if adjacent is None:
+                continue
+            if buf is None:
+                for adjacent_code in adjacent:
+                    yield domain[:i] + chr(adjacent_code) + domain[i + 1 :]
+                continue
+            for adjacent_code in adjacent:
+                buf[i] = adjacent_code
+                yield buf.decode("ascii")
+            buf[i] = code
 
     def _generate_visual_variants(self, domain: str) -> Generator[str, None, None]:
         """Generate variants using visually similar characters."""
         # Single character substitutions
+        vis_adj = _VIS_ADJ
         for i, char in enumerate(domain):
-            if char in self.VISUAL_CONFUSABLES:
-                for confusable in self.VISUAL_CONFUSABLES[char]:
-                    variant = domain[:i] + confusable + domain[i + 1 :]
-                    yield variant
+            code = ord(char)
+            confusables = vis_adj[code] if code < 128 else None
+            if confusables is None:
+                continue
+            for confusable in confusables:
+                variant = domain[:i] + confusable + domain[i + 1 :]
+                yield variant
 
         # Multi-character substitutions
-        for pattern, replacement in self.VISUAL_CONFUSABLES.items():
-            if len(pattern) > 1 and pattern in domain:
+        for pattern, replacement in _VIS_MULTI:
+            if pattern in domain:
                 for repl in replacement:
                     variant = domain.replace(pattern, repl)
                     if variant != domain:
@@ -313,11 +467,15 @@ class DomainGenerator:
 
     def _generate_idn_variants(self, domain: str) -> Generator[str, None, None]:
         """Generate IDN confusable variants."""
+        idn_adj = _IDN_ADJ
         for i, char in enumerate(domain):
-            if char in self.IDN_CONFUSABLES:
-                for confusable in self.IDN_CONFUSABLES[char]:
-                    variant = domain[:i] + confusable + domain[i + 1 :]
-                    yield variant
+            code = ord(char)
+            confusables = idn_adj[code] if code < 128 else None
+            if confusables is None:
+                continue
+            for confusable in confusables:
+                variant = domain[:i] + confusable + domain[i + 1 :]
+                yield variant
 
     def _generate_subdomain_variants(self, domain: str) -> Generator[str, None, None]:
         """Generate subdomain variants."""
@@ -332,21 +490,66 @@ class DomainGenerator:
 
     def _is_valid_domain_name(self, domain: str) -> bool:
         """Validate domain name format."""
-        if not domain or len(domain) > 253:
-            return False
-
-        # Basic domain validation
-        parts = domain.split(".")
-        if len(parts) < 2:
-            return False
-
-        for part in parts:
-            if not part or len(part) > 63:
-                return False
-            # Allow alphanumeric, hyphens, and some special chars for IDN
-            if not all(c.isalnum() or c == "-" or ord(c) > 127 for c in part):
-                return False
-            if part.startswith("-") or part.endswith("-"):
-                return False
-
-        return True
+        if domain.isascii():
+            return self._is_valid_ascii_domain(domain)
+        return self._is_valid_idn_domain(domain)
+
+    def _is_valid_ascii_domain(self, domain: str) -> bool:
+        """Validate a domain name known to be pure ASCII."""
+        return len(domain) <= 253 and _ASCII_DOMAIN_RE.fullmatch(domain) is not None
+
+    def _is_valid_idn_domain(self, domain: str) -> bool:
+        """Validate a domain name that may contain non-ASCII characters."""
+        return len(domain) <= 253 and _DOMAIN_RE.fullmatch(domain) is not None
+
+
+def _build_ord_table(
+    mapping: Dict[str, List[str]],
+) -> Tuple[Optional[Tuple[str, ...]], ...]:
+    """Build an ASCII lookup table indexed by ord() from a single-char mapping.
+
+    Multi-character keys are skipped; they are handled separately by the
+    generators that use them.
+    """
+    table: List[Optional[Tuple[str, ...]]] = [None] * 128
+    for char, replacements in mapping.items():
+        if len(char) == 1 and ord(char) < 128:
+            table[ord(char)] = tuple(replacements)
+    return tuple(table)
+
+
+# Replacement tables indexed by ord(char), built once at import time. Keyboard
+# neighbours are stored as bytes so they can be written straight into a buffer.
+_KB_ADJ = tuple(
+    None if adjacent is None else "".join(adjacent).encode("ascii")
+    for adjacent in _build_ord_table(DomainGenerator.KEYBOARD_LAYOUT)
+)
+_VIS_ADJ = _build_ord_table(DomainGenerator.VISUAL_CONFUSABLES)
+_IDN_ADJ = _build_ord_table(DomainGenerator.IDN_CONFUSABLES)
+
+# Multi-character visual confusables, applied with str.replace
+_VIS_MULTI = tuple(
+    (pattern, tuple(replacements))
+    for pattern, replacements in DomainGenerator.VISUAL_CONFUSABLES.items()
+    if len(pattern) > 1
+)
+
+# Generator instance owned by each worker process of the generation pool
+_worker_generator: Optional[DomainGenerator] = None
+
+
+def _init_worker(config: GeneratorConfig, tlds: AbstractSet[str]) -> None:
+    """Build the per-process generator once, instead of pickling it per task."""
+    global _worker_generator
+    _worker_generator = DomainGenerator(config, tlds)
+
+
+def _generate_chunk(domains: List[str]) -> List[str]:
+    """Generate variations for a chunk of input domains in a worker process."""
+    if _worker_generator is None:
+        raise RuntimeError("Worker process was not initialized")
+    return [
+        variation
+        for domain in domains
+        for variation in _worker_generator.generate_domain_variations(domain)
+    ]
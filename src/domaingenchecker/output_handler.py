@@ -2,25 +2,175 @@
 Advanced output handling with multiple formats and statistical reporting.
 """
 
-import csv
+import contextlib
+import functools
+import io
 import json
 import logging
+import re
+import sys
 import time
-from collections import Counter, defaultdict
-from pathlib import Path
-from typing import Any, Dict, List
-
-from rich import box
-from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
+from collections import Counter
+from itertools import islice
+from operator import attrgetter, methodcaller
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Union,
+    cast,
+)
 
 from .config import OutputConfig, OutputFormat
 from .dns_checker import DNSResult, DNSStatus
 
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.progress import Progress, TaskID
+    from rich.table import Table
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# Buffer size for result files, so many small row writes become few syscalls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Separators used by the plain text result file
+_TEXT_HEADER_RULE = "=" * 80 + "\n\n"
+_TEXT_RECORD_RULE = "-" * 40 + "\n"
+
+# Splits a domain into (head, ".", tld)
+_rpartition_dot = methodcaller("rpartition", ".")
+
+# Display names of each status
+_STATUS_TITLES = {status: status.value.title() for status in DNSStatus}
+
+# Body of the statistics panel, formatted with the statistics dict
+_STATS_TEMPLATE = """\
+[bold cyan]Total Domains:[/bold cyan] {total_domains:,}
+[bold green]Resolved:[/bold green] {resolved_count:,} ({resolution_rate:.1f}%)
+[bold red]Unresolved:[/bold red] {unresolved_count:,}
+[bold yellow]Errors:[/bold yellow] {error_count:,}
+[bold orange]Timeouts:[/bold orange] {timeout_count:,}
+
+[bold blue]Performance:[/bold blue]
+  Average Response: {avg_response_time:.3f}s
+  Min Response: {min_response_time:.3f}s
+  Max Response: {max_response_time:.3f}s
+  Total Time: {total_execution_time:.1f}s
+  Domains/Second: {domains_per_second:.1f}
+"""
+
+# Removes Rich markup tags such as "[bold red]" and "[/]" from a string
+_strip_markup = functools.partial(re.compile(r"\[(?:/|/?[a-z#@][^\[\]]*)\]").sub, "")
+
+# Maximum number of rows rendered per console table
+_TABLE_CHUNK_SIZE = 1000
+
+# CSV output columns, and characters that force a CSV field to be quoted
+_CSV_HEADER = "domain,status,ip_addresses,response_time,error_message,timestamp\r\n"
+_CSV_NEEDS_QUOTING = re.compile(r'[,"\r\n]').search
+
+
+def _csv_field(value: str) -> str:
+    """Quote a CSV field the way csv.writer does with QUOTE_MINIMAL."""
+    if _CSV_NEEDS_QUOTING(value):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _format_text_record(result: DNSResult, show_errors: bool) -> str:
+    """Format one result as a block of the plain text result file."""
+    record = f"Domain: {result.domain}\nStatus: {_STATUS_TITLES[result.status]}\n"
+
+    if result.ip_addresses:
+        record += f"IP Addresses: {', '.join(result.ip_addresses)}\n"
+
+    if result.response_time > 0:
+        record += f"Response Time: {result.response_time:.3f}s\n"
+
+    if result.error_message and show_errors:
+        record += f"Error: {result.error_message}\n"
+
+    return record + _TEXT_RECORD_RULE
+
+
+@contextlib.contextmanager
+def _untranslated_stdout() -> Iterator[TextIO]:
+    """Text stream over stdout's bytes that writes line endings unchanged.
+
+    CSV rows already end in CRLF, so newline translation on sys.stdout (as on
+    Windows) would turn them into CR CR LF. The wrapper is detached, not
+    closed, so stdout stays usable afterwards.
+    """
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        yield sys.stdout
+        return
+
+    sys.stdout.flush()
+    stream = io.TextIOWrapper(buffer, encoding="utf-8", newline="", write_through=True)
+    try:
+        yield stream
+    finally:
+        stream.flush()
+        stream.detach()
+
+
+@functools.lru_cache(maxsize=1024)
+def _short_error(message: Optional[str]) -> str:
+    """Error message as shown in the console table, truncated to 40 chars.
+
+    Failed lookups share a handful of distinct messages, so the display form
+    is computed once per message.
+    """
+    if not message:
+        return "-"
+    if len(message) > 40:
+        return message[:37] + "..."
+    return message
+
+
+class _PlainConsole:
+    """Stand-in for the Rich console when stdout is not a terminal.
+
+    Only the print() calls made by OutputHandler are supported; strings are
+    written with their markup removed, so piped runs never import Rich.
+    """
+
+    def print(self, *objects: Any, markup: bool = True, **kwargs: Any) -> None:
+        """Write objects to stdout, separated by spaces."""
+        text = " ".join(map(str, objects))
+        sys.stdout.write((_strip_markup(text) if markup else text) + "\n")
+
+
+class _NullProgress:
+    """Progress bar that shows nothing, used alongside _PlainConsole."""
+
+    def __enter__(self) -> "_NullProgress":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def add_task(self, description: str, **kwargs: Any) -> "TaskID":
+        """Accept a task and return a placeholder task ID."""
+        return cast("TaskID", 0)
+
+    def update(self, task_id: "TaskID", **kwargs: Any) -> None:
+        """Ignore a task update."""
+
 
 class OutputHandler:
     """Advanced output handler with multiple formats and rich console output."""
@@ -32,16 +182,36 @@ class OutputHandler:
             config: Output configuration
         """
         self.config = config
-        self.console = Console(
-            force_terminal=True if config.colorize else None,
-            no_color=not config.colorize,
-        )
         self.results: List[DNSResult] = []
+        # Finished Rich markup for the status column, one entry per status
+        self._status_markup = {
+            status: "[{0}]{1}[/{0}]".format(
+                self._get_status_color(status), status.value.title()
+            )
+            for status in DNSStatus
+        }
         self.statistics: Dict[str, Any] = {}
         self.start_time = time.time()
 
         logger.info(f"Initialized OutputHandler with format: {config.format}")
 
+    @functools.cached_property
+    def console(self) -> Union["Console", _PlainConsole]:
+        """Console for all output, created on first use.
+
+        When stdout is not a terminal (piped or redirected runs) a plain
+        sink is used and Rich is never imported.
+        """
+        if not sys.stdout.isatty():
+            return _PlainConsole()
+
+        from rich.console import Console
+
+        return Console(
+            force_terminal=True if self.config.colorize else None,
+            no_color=not self.config.colorize,
+        )
+
     def add_results(self, results: List[DNSResult]) -> None:
         """Add DNS results for processing.
 
@@ -78,54 +248,51 @@ class OutputHandler:
         if total_results == 0:
             return
 
-        # Status distribution
-        status_counts = Counter(result.status for result in self.results)
+        results = self.results
 
-        # Response time statistics
-        response_times = [r.response_time for r in self.results if r.response_time > 0]
-        avg_response_time = (
-            sum(response_times) / len(response_times) if response_times else 0
-        )
-        min_response_time = min(response_times) if response_times else 0
-        max_response_time = max(response_times) if response_times else 0
-
-        # Domain analysis
-        resolved_domains = [r for r in self.results if r.status == DNSStatus.RESOLVED]
-        unresolved_domains = [
-            r for r in self.results if r.status == DNSStatus.UNRESOLVED
+        # Response times are reduced with C-level builtins over one column
+        response_times = [
+            rt for rt in map(attrgetter("response_time"), results) if rt > 0
         ]
-        error_domains = [r for r in self.results if r.status == DNSStatus.ERROR]
-        timeout_domains = [r for r in self.results if r.status == DNSStatus.TIMEOUT]
+        if response_times:
+            avg_response_time = sum(response_times) / len(response_times)
+            min_response_time = min(response_times)
+            max_response_time = max(response_times)
+        else:
+            avg_response_time = min_response_time = max_response_time = 0
 
-        # TLD analysis
-        tld_distribution: Dict[str, int] = defaultdict(int)
-        for result in self.results:
-            if "." in result.domain:
-                tld = result.domain.split(".")[-1]
-                tld_distribution[tld] += 1
+        # Counters are fed straight from C-level map/filter iterators
+        status_counts: Counter[DNSStatus] = Counter(map(attrgetter("status"), results))
+        error_messages: Counter[str] = Counter(
+            filter(None, map(attrgetter("error_message"), results))
+        )
+        tld_distribution: Counter[str] = Counter(
+            tld
+            for _, dot, tld in map(_rpartition_dot, map(attrgetter("domain"), results))
+            if dot
+        )
+
+        resolved_count = status_counts[DNSStatus.RESOLVED]
+        elapsed = time.time() - self.start_time
 
         # Build statistics
         self.statistics = {
             "total_domains": total_results,
-            "resolved_count": len(resolved_domains),
-            "unresolved_count": len(unresolved_domains),
-            "error_count": len(error_domains),
-            "timeout_count": len(timeout_domains),
-            "resolution_rate": (len(resolved_domains) / total_results) * 100,
+            "resolved_count": resolved_count,
+            "unresolved_count": status_counts[DNSStatus.UNRESOLVED],
+            "error_count": status_counts[DNSStatus.ERROR],
+            "timeout_count": status_counts[DNSStatus.TIMEOUT],
+            "resolution_rate": (resolved_count / total_results) * 100,
             "avg_response_time": avg_response_time,
             "min_response_time": min_response_time,
             "max_response_time": max_response_time,
-            "total_execution_time": time.time() - self.start_time,
-            "domains_per_second": total_results / (time.time() - self.start_time),
+            "total_execution_time": elapsed,
+            "domains_per_second": total_results / elapsed if elapsed > 0 else 0.0,
             "status_distribution": {
                 status.value: count for status, count in status_counts.items()
             },
-            "top_tlds": dict(
-                sorted(tld_distribution.items(), key=lambda x: x[1], reverse=True)[:10]
-            ),
-            "error_messages": Counter(
-                r.error_message for r in self.results if r.error_message
-            ),
+            "top_tlds": dict(tld_distribution.most_common(10)),
+            "error_messages": error_messages,
         }
 
     def _output_text(self) -> None:
@@ -136,10 +303,62 @@ class OutputHandler:
             self._display_text_console()
 
     def _display_text_console(self) -> None:
-        """Display results in console using Rich formatting."""
-        # Create main results table
+        """Display results in console using Rich formatting.
+
+        Results are printed as a series of tables of at most
+        _TABLE_CHUNK_SIZE rows, so output starts early and Rich never holds
+        cells for every result at once. Without a terminal the plain text
+        file format is written instead.
+        """
+        if isinstance(self.console, _PlainConsole):
+            self._write_text(sys.stdout)
+            sys.stdout.flush()
+            return
+
+        title: Optional[str] = (
+            f"Domain Resolution Results ({len(self.results)} domains)"
+        )
+        show_errors = self.config.verbosity >= 2
+        results = self._filter_results()
+
+        while True:
+            chunk = list(islice(results, _TABLE_CHUNK_SIZE))
+            if not chunk:
+                break
+
+            table = self._create_results_table(title, show_errors)
+            title = None
+
+            # Add rows based on filters
+            for result in chunk:
+                status_text = self._status_markup[result.status]
+
+                # Format IP addresses
+                ips = ", ".join(result.ip_addresses) if result.ip_addresses else "-"
+
+                # Format response time
+                response_time = (
+                    f"{result.response_time:.3f}s" if result.response_time > 0 else "-"
+                )
+
+                row = [result.domain, status_text, ips, response_time]
+
+                if show_errors:
+                    row.append(_short_error(result.error_message))
+
+                table.add_row(*row)
+
+            self.console.print(table)
+
+        self.console.print()
+
+    def _create_results_table(self, title: Optional[str], show_errors: bool) -> "Table":
+        """Create an empty results table with the configured columns."""
+        from rich import box
+        from rich.table import Table
+
         table = Table(
-            title=f"Domain Resolution Results ({len(self.results)} domains)",
+            title=title,
             box=box.ROUNDED,
             show_header=True,
             header_style="bold magenta",
@@ -150,64 +369,35 @@ class OutputHandler:
         table.add_column("IP Addresses", style="green", no_wrap=False, min_width=15)
         table.add_column("Response Time", justify="right", min_width=13)
 
-        if self.config.verbosity >= 2:
+        if show_errors:
             table.add_column("Error", style="red", no_wrap=False)
 
-        # Add rows based on filters
-        for result in self._filter_results():
-            status_color = self._get_status_color(result.status)
-            status_text = (
-                f"[{status_color}]{result.status.value.title()}[/{status_color}]"
-            )
-
-            # Format IP addresses
-            ips = ", ".join(result.ip_addresses) if result.ip_addresses else "-"
-
-            # Format response time
-            response_time = (
-                f"{result.response_time:.3f}s" if result.response_time > 0 else "-"
-            )
-
-            row = [result.domain, status_text, ips, response_time]
-
-            if self.config.verbosity >= 2:
-                error_msg = result.error_message or "-"
-                if len(error_msg) > 40:
-                    error_msg = error_msg[:37] + "..."
-                row.append(error_msg)
-
-            table.add_row(*row)
-
-        self.console.print(table)
-        self.console.print()
+        return table
 
     def _save_text_to_file(self) -> None:
         """Save text output to file."""
         if self.config.output_file is None:
             return
-        with open(self.config.output_file, "w", encoding="utf-8") as f:
-            f.write(
-                f"Domain Resolution Results - {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
-            )
-            f.write("=" * 80 + "\n\n")
-
-            for result in self._filter_results():
-                f.write(f"Domain: {result.domain}\n")
-                f.write(f"Status: {result.status.value.title()}\n")
-
-                if result.ip_addresses:
-                    f.write(f"IP Addresses: {', '.join(result.ip_addresses)}\n")
-
-                if result.response_time > 0:
-                    f.write(f"Response Time: {result.response_time:.3f}s\n")
-
-                if result.error_message and self.config.verbosity >= 2:
-                    f.write(f"Error: {result.error_message}\n")
-
-                f.write("-" * 40 + "\n")
+        with open(
+            self.config.output_file,
+            "w",
+            encoding="utf-8",
+            buffering=_WRITE_BUFFER_SIZE,
+        ) as f:
+            self._write_text(f)
 
         logger.info(f"Text output saved to {self.config.output_file}")
 
+    def _write_text(self, f: TextIO) -> None:
+        """Write results in the plain text format to an open file."""
+        f.write(f"Domain Resolution Results - {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(_TEXT_HEADER_RULE)
+        show_errors = self.config.verbosity >= 2
+        f.writelines(
+            _format_text_record(result, show_errors)
+            for result in self._filter_results()
+        )
+
     def _output_json(self) -> None:
         """Output results in JSON format."""
         output_data = {
@@ -230,102 +420,106 @@ class OutputHandler:
             ],
         }
 
+        if HAS_ORJSON:
+            # orjson always emits UTF-8, matching ensure_ascii=False
+            encoded = orjson.dumps(output_data, option=orjson.OPT_INDENT_2)
+        else:
+            encoded = json.dumps(output_data, indent=2, ensure_ascii=False).encode(
+                "utf-8"
+            )
+
         if self.config.output_file:
-            with open(self.config.output_file, "w", encoding="utf-8") as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            with open(self.config.output_file, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(encoded)
             logger.info(f"JSON output saved to {self.config.output_file}")
         else:
-            self.console.print(json.dumps(output_data, indent=2, ensure_ascii=False))
+            self.console.print(encoded.decode("utf-8"), markup=False)
 
     def _output_csv(self) -> None:
-        """Output results in CSV format."""
-        fieldnames = [
-            "domain",
-            "status",
-            "ip_addresses",
-            "response_time",
-            "error_message",
-            "timestamp",
-        ]
+        """Output results in CSV format.
 
+        Rows have a fixed shape, so they are formatted directly rather than
+        through csv.DictWriter, using the same excel dialect rules (minimal
+        quoting, CRLF line endings).
+        """
+        output: ContextManager[TextIO]
         if self.config.output_file:
-            output_file = self.config.output_file
+            output = open(
+                self.config.output_file,
+                "w",
+                newline="",
+                encoding="utf-8",
+                buffering=_WRITE_BUFFER_SIZE,
+            )
         else:
-            output_file = Path("/dev/stdout")  # Output to stdout
-
-        with open(output_file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for result in self._filter_results():
-                writer.writerow(
-                    {
-                        "domain": result.domain,
-                        "status": result.status.value,
-                        "ip_addresses": ";".join(result.ip_addresses),
-                        "response_time": result.response_time,
-                        "error_message": result.error_message or "",
-                        "timestamp": result.timestamp,
-                    }
-                )
+            # Write to stdout without newline translation; it is never closed
+            output = _untranslated_stdout()
+
+        with output as f:
+            f.write(_CSV_HEADER)
+
+            f.writelines(
+                f"{_csv_field(result.domain)},"
+                f"{result.status.value},"
+                f"{';'.join(result.ip_addresses)},"
+                f"{result.response_time},"
+                f"{_csv_field(result.error_message or '')},"
+                f"{result.timestamp}\r\n"
+                for result in self._filter_results()
+            )
+            f.flush()
 
         if self.config.output_file:
             logger.info(f"CSV output saved to {self.config.output_file}")
 
-    def _filter_results(self) -> List[DNSResult]:
+    def _filter_results(self) -> Iterator[DNSResult]:
         """Filter results based on configuration."""
-        filtered = self.results
-
-        # Filter out unresolved domains if not wanted
-        if not self.config.include_unresolved:
-            filtered = [r for r in filtered if r.status != DNSStatus.UNRESOLVED]
+        if self.config.include_unresolved:
+            return iter(self.results)
 
-        return filtered
+        # Filter out unresolved domains lazily, without copying the results
+        unresolved = DNSStatus.UNRESOLVED
+        return (r for r in self.results if r.status is not unresolved)
 
     def _display_statistics(self) -> None:
         """Display comprehensive statistics."""
         if not self.statistics:
             return
 
-        # Create statistics panel
-        stats_content = []
-
-        # Basic counts
-        stats_content.extend(
-            [
-                f"[bold cyan]Total Domains:[/bold cyan] {self.statistics['total_domains']:,}",
-                f"[bold green]Resolved:[/bold green] {self.statistics['resolved_count']:,} ({self.statistics['resolution_rate']:.1f}%)",
-                f"[bold red]Unresolved:[/bold red] {self.statistics['unresolved_count']:,}",
-                f"[bold yellow]Errors:[/bold yellow] {self.statistics['error_count']:,}",
-                f"[bold orange]Timeouts:[/bold orange] {self.statistics['timeout_count']:,}",
-                "",
-            ]
-        )
-
-        # Performance stats
-        stats_content.extend(
-            [
-                f"[bold blue]Performance:[/bold blue]",
-                f"  Average Response: {self.statistics['avg_response_time']:.3f}s",
-                f"  Min Response: {self.statistics['min_response_time']:.3f}s",
-                f"  Max Response: {self.statistics['max_response_time']:.3f}s",
-                f"  Total Time: {self.statistics['total_execution_time']:.1f}s",
-                f"  Domains/Second: {self.statistics['domains_per_second']:.1f}",
-                "",
-            ]
-        )
+        stats_content = _STATS_TEMPLATE.format_map(self.statistics)
 
         # Top TLDs
         if self.statistics["top_tlds"]:
-            stats_content.append("[bold magenta]Top TLDs:[/bold magenta]")
-            for tld, count in list(self.statistics["top_tlds"].items())[:5]:
-                stats_content.append(f"  .{tld}: {count:,}")
+            stats_content += "\n[bold magenta]Top TLDs:[/bold magenta]\n" + "\n".join(
+                f"  .{tld}: {count:,}"
+                for tld, count in islice(self.statistics["top_tlds"].items(), 5)
+            )
+
+        self._print_panel(stats_content, "Statistics", "blue", "ROUNDED")
+
+    def _print_panel(
+        self, content: str, title: str, border_style: str, box_name: str
+    ) -> None:
+        """Print content in a titled Rich panel, or as plain lines without Rich.
+
+        Args:
+            content: Panel body, with Rich markup
+            title: Panel title
+            border_style: Rich style of the panel border
+            box_name: Name of the rich.box style to draw the panel with
+        """
+        if isinstance(self.console, _PlainConsole):
+            self.console.print(f"{title}\n{content}")
+            return
+
+        from rich import box
+        from rich.panel import Panel
 
         panel = Panel(
-            "\n".join(stats_content),
-            title="[bold white]Statistics[/bold white]",
-            border_style="blue",
-            box=box.ROUNDED,
+            content,
+            title=f"[bold white]{title}[/bold white]",
+            border_style=border_style,
+            box=getattr(box, box_name),
         )
 
         self.console.print(panel)
@@ -340,15 +534,20 @@ class OutputHandler:
         }
         return color_map.get(status, "white")
 
-    def display_progress(self, total: int) -> Progress:
+    def display_progress(self, total: int) -> Union["Progress", _NullProgress]:
         """Create and return a progress bar for domain checking.
 
         Args:
             total: Total number of domains to check
 
         Returns:
-            Progress bar instance
+            Progress bar instance, a no-op one when stdout is not a terminal
         """
+        if isinstance(self.console, _PlainConsole):
+            return _NullProgress()
+
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         progress = Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -366,25 +565,18 @@ class OutputHandler:
 
         Args:
             input_domains: Number of input domains
-            generated_domains: Number of generated domain variations
+            generated_domains: Maximum number of generated domain variations
         """
         header_text = f"""
 [bold cyan]DomainGenChecker v2.1[/bold cyan] - Advanced Typosquatting Detection
         
 [bold]Input Configuration:[/bold]
 • Input domains: {input_domains:,}
-• Generated variations: {generated_domains:,}
+• Max variations: {generated_domains:,}
 • Output format: {self.config.format.value.upper()}
         """
 
-        panel = Panel(
-            header_text.strip(),
-            title="[bold white]Scan Summary[/bold white]",
-            border_style="cyan",
-            box=box.DOUBLE,
-        )
-
-        self.console.print(panel)
+        self._print_panel(header_text.strip(), "Scan Summary", "cyan", "DOUBLE")
         self.console.print()
 
     def display_error(self, message: str) -> None:
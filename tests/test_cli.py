@@ -0,0 +1,244 @@
+"""
+Tests for command-line interface helpers.
+"""
+
+import asyncio
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from domaingenchecker import dns_checker, domain_generator
+from domaingenchecker.cli import _check_batch, load_domains_from_file, run_domain_check
+from domaingenchecker.config import Config
+from domaingenchecker.dns_checker import DNSResult, DNSStatus, PersistentDNSCache
+
+
+class TestLoadDomainsFromFile:
+    """Test cases for load_domains_from_file."""
+
+    def test_regular_file(self, tmp_path):
+        """Test that comments and blank lines are skipped."""
+        path = tmp_path / "domains.txt"
+        path.write_bytes(b"Example.com\n\n# comment\n  test.org  \r\n")
+
+        assert load_domains_from_file(path) == ["example.com", "test.org"]
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file yields no domains."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+
+        assert load_domains_from_file(path) == []
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires os.mkfifo")
+    def test_pipe(self, tmp_path):
+        """Test that a FIFO, which reports a size of 0, is read fully."""
+        path = tmp_path / "domains.fifo"
+        os.mkfifo(path)
+
+        def feed():
+            with open(path, "wb") as f:
+                f.write(b"example.com\ntest.org\n")
+
+        writer = threading.Thread(target=feed)
+        writer.start()
+        try:
+            assert load_domains_from_file(path) == ["example.com", "test.org"]
+        finally:
+            writer.join()
+
+
+class TestCheckBatch:
+    """Test cases for _check_batch."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.checked = []
+
+        async def check_domains(domains, use_cache=True):
+            self.checked.append(list(domains))
+            return [
+                DNSResult(
+                    domain=domain,
+                    status=(
+                        DNSStatus.TIMEOUT if "slow" in domain else DNSStatus.RESOLVED
+                    ),
+                    ip_addresses=[] if "slow" in domain else ["192.0.2.1"],
+                    response_time=0.1,
+                )
+                for domain in domains
+            ]
+
+        self.checker = SimpleNamespace(check_domains=check_domains)
+
+    def test_merges_cache_hits_in_batch_order(self, tmp_path):
+        """Test that cached and fresh results are returned in batch order."""
+        disk_cache = PersistentDNSCache(tmp_path / "dns.sqlite")
+        disk_cache.set_many(
+            [
+                DNSResult(
+                    domain="b.com",
+                    status=DNSStatus.UNRESOLVED,
+                    ip_addresses=[],
+                    response_time=0.1,
+                )
+            ]
+        )
+        batch = ["a.com", "b.com", "slow.com", "c.com"]
+
+        results = asyncio.run(_check_batch(self.checker, batch, True, disk_cache))
+
+        assert [r.domain for r in results] == batch
+        assert [r.status for r in results] == [
+            DNSStatus.RESOLVED,
+            DNSStatus.UNRESOLVED,
+            DNSStatus.TIMEOUT,
+            DNSStatus.RESOLVED,
+        ]
+        assert self.checked == [["a.com", "slow.com", "c.com"]]
+        # Only definitive answers are persisted for the next run
+        assert set(disk_cache.get_many(batch)) == {"a.com", "b.com", "c.com"}
+        disk_cache.close()
+
+    def test_without_disk_cache(self):
+        """Test that every domain is checked when there is no disk cache."""
+        batch = ["a.com", "b.com"]
+
+        results = asyncio.run(_check_batch(self.checker, batch, True, None))
+
+        assert [r.domain for r in results] == batch
+        assert self.checked == [batch]
+
+
+class FakeDNSChecker:
+    """DNS checker stand-in that answers without network access."""
+
+    health_checks = 0
+
+    def __init__(self, config):
+        self.config = config
+
+    async def health_check(self):
+        FakeDNSChecker.health_checks += 1
+        return True
+
+    async def check_domains(self, domains, use_cache=True):
+        return [
+            DNSResult(
+                domain=domain,
+                status=DNSStatus.UNRESOLVED,
+                ip_addresses=[],
+                response_time=0.1,
+            )
+            for domain in domains
+        ]
+
+    def get_statistics(self):
+        return {"cache_size": 0}
+
+
+class TestRunDomainCheck:
+    """Test cases for run_domain_check."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        FakeDNSChecker.health_checks = 0
+
+    def _config(self, tmp_path):
+        config = Config()
+        config.output.include_statistics = False
+        config.cache_file = tmp_path / "dns.sqlite"
+        return config
+
+    def _tld_file(self, tmp_path):
+        tld_file = tmp_path / "tlds.txt"
+        tld_file.write_text("COM\nNET\nORG\n")
+        return tld_file
+
+    def test_disk_cache_closed_on_error(self, tmp_path, monkeypatch):
+        """Test that the persistent cache is closed when checking fails."""
+        closed = []
+
+        class FailingChecker(FakeDNSChecker):
+            async def check_domains(self, domains, use_cache=True):
+                raise RuntimeError("resolver exploded")
+
+        class TrackedCache(PersistentDNSCache):
+            def close(self):
+                closed.append(True)
+                super().close()
+
+        monkeypatch.setattr(dns_checker, "DNSChecker", FailingChecker)
+        monkeypatch.setattr(dns_checker, "PersistentDNSCache", TrackedCache)
+        config = self._config(tmp_path)
+        config.persistent_cache = True
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(
+                run_domain_check(
+                    config, "example.com", self._tld_file(tmp_path), "domain"
+                )
+            )
+
+        assert closed == [True]
+
+    def test_health_check_skipped_in_domain_mode(self, tmp_path, monkeypatch):
+        """Test that a single-domain run does not probe the resolver."""
+        monkeypatch.setattr(dns_checker, "DNSChecker", FakeDNSChecker)
+
+        asyncio.run(
+            run_domain_check(
+                self._config(tmp_path),
+                "example.com",
+                self._tld_file(tmp_path),
+                "domain",
+            )
+        )
+
+        assert FakeDNSChecker.health_checks == 0
+
+    def test_health_check_runs_for_domain_files(self, tmp_path, monkeypatch):
+        """Test that file runs above the threshold probe the resolver."""
+        monkeypatch.setattr(dns_checker, "DNSChecker", FakeDNSChecker)
+        domains_file = tmp_path / "domains.txt"
+        domains_file.write_text("example.com\ntest.org\n")
+
+        asyncio.run(
+            run_domain_check(
+                self._config(tmp_path),
+                str(domains_file),
+                self._tld_file(tmp_path),
+                "file",
+            )
+        )
+
+        assert FakeDNSChecker.health_checks == 1
+
+    def test_variations_generated_off_event_loop(self, tmp_path, monkeypatch):
+        """Test that batches are generated outside the event loop thread."""
+        monkeypatch.setattr(dns_checker, "DNSChecker", FakeDNSChecker)
+        threads = set()
+        generate = domain_generator.DomainGenerator.generate_variations
+
+        def recording_generate(self, domains, workers=1):
+            for variation in generate(self, domains, workers):
+                threads.add(threading.get_ident())
+                yield variation
+
+        monkeypatch.setattr(
+            domain_generator.DomainGenerator, "generate_variations", recording_generate
+        )
+
+        asyncio.run(
+            run_domain_check(
+                self._config(tmp_path),
+                "example.com",
+                self._tld_file(tmp_path),
+                "domain",
+            )
+        )
+
+        assert threads
+        assert threading.get_ident() not in threads
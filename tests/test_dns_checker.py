@@ -0,0 +1,331 @@
+"""
+Tests for DNS checker functionality.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import dns.resolver
+
+from domaingenchecker.config import DNSConfig
+from domaingenchecker.dns_checker import (
+    DNSCache,
+    DNSChecker,
+    DNSResult,
+    DNSStatus,
+    PersistentDNSCache,
+)
+
+
+class TestPersistentDNSCache:
+    """Test cases for PersistentDNSCache class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.resolved = DNSResult(
+            domain="example.com",
+            status=DNSStatus.RESOLVED,
+            ip_addresses=["192.0.2.1", "192.0.2.2"],
+            response_time=0.1,
+        )
+        self.unresolved = DNSResult(
+            domain="examp1e.com",
+            status=DNSStatus.UNRESOLVED,
+            ip_addresses=[],
+            response_time=0.1,
+        )
+        self.error = DNSResult(
+            domain="exampl.com",
+            status=DNSStatus.ERROR,
+            ip_addresses=[],
+            response_time=0.1,
+            error_message="boom",
+        )
+
+    def test_round_trip(self, tmp_path):
+        """Test that definitive results survive reopening the cache."""
+        path = tmp_path / "cache" / "dns.sqlite"
+        cache = PersistentDNSCache(path)
+        cache.set_many([self.resolved, self.unresolved])
+        cache.close()
+
+        cache = PersistentDNSCache(path)
+        found = cache.get_many(["example.com", "examp1e.com", "missing.com"])
+        cache.close()
+
+        assert set(found) == {"example.com", "examp1e.com"}
+        assert found["example.com"].status == DNSStatus.RESOLVED
+        assert found["example.com"].ip_addresses == ["192.0.2.1", "192.0.2.2"]
+        assert found["examp1e.com"].status == DNSStatus.UNRESOLVED
+        assert found["examp1e.com"].ip_addresses == []
+
+    def test_other_resolver_misses(self, tmp_path):
+        """Test that answers from one resolver are not served for another."""
+        path = tmp_path / "dns.sqlite"
+        cache = PersistentDNSCache(path, resolver="10.0.0.53")
+        cache.set_many([self.unresolved])
+        cache.close()
+
+        cache = PersistentDNSCache(path, resolver="system")
+        assert cache.get_many(["examp1e.com"]) == {}
+        cache.close()
+
+        cache = PersistentDNSCache(path, resolver="10.0.0.53")
+        assert set(cache.get_many(["examp1e.com"])) == {"examp1e.com"}
+        cache.close()
+
+    def test_transient_results_not_stored(self, tmp_path):
+        """Test that errors and timeouts are not persisted."""
+        cache = PersistentDNSCache(tmp_path / "dns.sqlite")
+        cache.set_many([self.error])
+
+        assert cache.get_many(["exampl.com"]) == {}
+        cache.close()
+
+    def test_expired_entries_ignored(self, tmp_path):
+        """Test that expired entries are not returned."""
+        cache = PersistentDNSCache(tmp_path / "dns.sqlite", ttl=-1, negative_ttl=-1)
+        cache.set_many([self.resolved, self.unresolved])
+
+        assert cache.get_many(["example.com", "examp1e.com"]) == {}
+        cache.close()
+
+    def test_lookup_larger_than_parameter_limit(self, tmp_path):
+        """Test that lookups are chunked below SQLite's parameter limit."""
+        cache = PersistentDNSCache(tmp_path / "dns.sqlite")
+        cache.set_many([self.resolved])
+
+        domains = [f"d{i}.com" for i in range(2500)] + ["example.com"]
+        assert set(cache.get_many(domains)) == {"example.com"}
+        cache.close()
+
+
+class TestDNSCache:
+    """Test cases for DNSCache class."""
+
+    def _result(self, domain):
+        return DNSResult(
+            domain=domain,
+            status=DNSStatus.UNRESOLVED,
+            ip_addresses=[],
+            response_time=0.1,
+        )
+
+    def test_get_and_set(self):
+        """Test basic cache round trip."""
+        cache = DNSCache(ttl=60)
+        result = self._result("example.com")
+        cache.set("example.com", result)
+
+        assert cache.get("example.com") is result
+        assert cache.get("missing.com") is None
+        assert cache.size() == 1
+
+    def test_expired_entry_not_returned(self):
+        """Test that expired entries are dropped on access."""
+        cache = DNSCache(ttl=-1, negative_ttl=-1)
+        cache.set("example.com", self._result("example.com"))
+
+        assert cache.get("example.com") is None
+        assert cache.size() == 0
+
+    def test_negative_ttl_applies_to_unresolved(self):
+        """Test that only unresolved results use the negative TTL."""
+        cache = DNSCache(ttl=60, negative_ttl=-1)
+        resolved = DNSResult(
+            domain="example.com",
+            status=DNSStatus.RESOLVED,
+            ip_addresses=["192.0.2.1"],
+            response_time=0.1,
+        )
+        cache.set("example.com", resolved)
+        cache.set("examp1e.com", self._result("examp1e.com"))
+
+        assert cache.get("example.com") is resolved
+        assert cache.get("examp1e.com") is None
+
+    def test_purge_expired(self):
+        """Test that expired entries are purged without being accessed."""
+        cache = DNSCache(ttl=-1, negative_ttl=-1)
+        for i in range(DNSCache.PURGE_INTERVAL):
+            cache.set(f"d{i}.com", self._result(f"d{i}.com"))
+
+        assert cache.size() == 0
+
+    def test_overwrite_survives_stale_heap_entry(self):
+        """Test that purging a stale heap item keeps the newer entry."""
+        cache = DNSCache(ttl=-1, negative_ttl=-1)
+        cache.set("example.com", self._result("example.com"))
+        cache.negative_ttl = 60
+        result = self._result("example.com")
+        cache.set("example.com", result)
+        cache._purge_expired()
+
+        assert cache.get("example.com") is result
+
+
+class TestDNSChecker:
+    """Test cases for DNSChecker batch checking."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.checker = DNSChecker(DNSConfig(concurrent_limit=3, rate_limit=1000.0))
+
+        async def fake_resolve(domain):
+            if domain.startswith("bad"):
+                raise RuntimeError("resolver exploded")
+            return ["192.0.2.1"] if domain.startswith("ok") else []
+
+        self.checker._resolve_domain = fake_resolve
+
+    def test_check_domains_preserves_order(self):
+        """Test that results come back in input order, one per domain."""
+        domains = [f"ok{i}.com" if i % 2 else f"nx{i}.com" for i in range(20)]
+
+        results = asyncio.run(self.checker.check_domains(domains))
+
+        assert [r.domain for r in results] == domains
+        assert results[1].status == DNSStatus.RESOLVED
+        assert results[0].status == DNSStatus.UNRESOLVED
+
+    def test_check_domains_uses_cache(self):
+        """Test that cached domains are answered from the cache."""
+        cached = DNSResult(
+            domain="ok.com",
+            status=DNSStatus.RESOLVED,
+            ip_addresses=["198.51.100.1"],
+            response_time=0.1,
+        )
+        self.checker.cache.set("ok.com", cached)
+
+        results = asyncio.run(self.checker.check_domains(["ok.com", "nx.com"]))
+
+        assert results[0] is cached
+        assert results[1].status == DNSStatus.UNRESOLVED
+
+    def test_check_domains_reports_errors(self):
+        """Test that resolver failures become error results for that domain."""
+        results = asyncio.run(self.checker.check_domains(["bad.com"]))
+
+        assert results[0].domain == "bad.com"
+        assert results[0].status == DNSStatus.ERROR
+        assert results[0].error_message == "resolver exploded"
+
+    def test_concurrent_limit_shared_across_calls(self):
+        """Test that concurrent check_domains calls share one lookup limit."""
+        active = 0
+        peak = 0
+
+        async def slow_resolve(domain):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return []
+
+        self.checker._resolve_domain = slow_resolve
+
+        async def two_batches():
+            return await asyncio.gather(
+                self.checker.check_domains([f"a{i}.com" for i in range(10)]),
+                self.checker.check_domains([f"b{i}.com" for i in range(10)]),
+            )
+
+        first, second = asyncio.run(two_batches())
+
+        assert peak == 3
+        assert len(self.checker._workers) == 3
+        assert [r.domain for r in second] == [f"b{i}.com" for i in range(10)]
+        assert len(first) == 10
+
+    def test_rate_limit_allows_burst_then_throttles(self):
+        """Test that queries beyond one second's burst wait for new tokens."""
+        checker = DNSChecker(DNSConfig(rate_limit=50.0))
+
+        async def acquire(count):
+            for _ in range(count):
+                await checker._acquire_token()
+
+        start = time.monotonic()
+        asyncio.run(acquire(50))
+        burst = time.monotonic() - start
+
+        start = time.monotonic()
+        asyncio.run(acquire(10))
+        throttled = time.monotonic() - start
+
+        assert burst < 0.1
+        assert throttled >= 0.15
+
+    def test_check_domain_full_collects_records(self):
+        """Test that a full check fills records and derives the addresses."""
+        records = {"AAAA": ["2001:db8::1"], "MX": ["10 mail.example.com."]}
+
+        async def fake_query(domain, record_type):
+            return SimpleNamespace(rrset=records.get(record_type))
+
+        self.checker._query = fake_query
+
+        asyncio.run(self.checker.check_domain("ok.com"))
+        result = asyncio.run(self.checker.check_domain("ok.com", full=True))
+
+        assert result.status == DNSStatus.RESOLVED
+        assert result.ip_addresses == ["2001:db8::1"]
+        assert result.records["MX"] == ["10 mail.example.com."]
+        assert result.records["A"] == []
+
+
+class TestDNSCheckerStatus:
+    """Test cases for mapping lookup outcomes to a status."""
+
+    def _check(self, a_outcome, aaaa_outcome=None):
+        checker = DNSChecker(DNSConfig(rate_limit=1000.0))
+        outcomes = {"A": a_outcome, "AAAA": aaaa_outcome or a_outcome}
+
+        async def fake_query(domain, record_type):
+            outcome = outcomes[record_type]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        checker._query = fake_query
+        return asyncio.run(checker.check_domain("example.com", use_cache=False))
+
+    def test_nxdomain_is_unresolved(self):
+        """Test that a nonexistent name is a definitive negative."""
+        result = self._check(dns.resolver.NXDOMAIN())
+
+        assert result.status == DNSStatus.UNRESOLVED
+
+    def test_empty_answers_are_unresolved(self):
+        """Test that empty NOERROR answers for A and AAAA are unresolved."""
+        result = self._check(SimpleNamespace(rrset=None))
+
+        assert result.status == DNSStatus.UNRESOLVED
+
+    def test_timeout_is_not_unresolved(self):
+        """Test that a resolver timeout is reported as a timeout."""
+        result = self._check(
+            dns.resolver.LifetimeTimeout(timeout=1.0, errors=[]),
+            SimpleNamespace(rrset=None),
+        )
+
+        assert result.status == DNSStatus.TIMEOUT
+
+    def test_resolver_failure_is_error(self):
+        """Test that failing nameservers are reported as an error."""
+        result = self._check(dns.resolver.NoNameservers())
+
+        assert result.status == DNSStatus.ERROR
+        assert result.ip_addresses == []
+
+    def test_addresses_win_over_failure(self):
+        """Test that AAAA records resolve the name even if A failed."""
+        result = self._check(
+            dns.resolver.NoNameservers(), SimpleNamespace(rrset=["2001:db8::1"])
+        )
+
+        assert result.status == DNSStatus.RESOLVED
+        assert result.ip_addresses == ["2001:db8::1"]
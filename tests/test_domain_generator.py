@@ -3,7 +3,7 @@ Tests for domain generator functionality.
 """
 
 from domaingenchecker.config import GeneratorConfig
-from domaingenchecker.domain_generator import DomainGenerator
+from domaingenchecker.domain_generator import PARALLEL_MIN_DOMAINS, DomainGenerator
 
 
 class TestDomainGenerator:
@@ -37,6 +37,7 @@ class TestDomainGenerator:
             "sub.example.com",
             "test-domain.org",
             "a.co",
+            "exаmple.com",  # IDN confusable
         ]
 
         invalid_domains = [
@@ -46,6 +47,9 @@ class TestDomainGenerator:
             "-invalid.com",  # Starts with hyphen
             "invalid-.com",  # Ends with hyphen
             ".com",  # Missing domain
+            "a..com",  # Empty label
+            "ex@mple.com",  # Invalid character
+            "example.com\n",  # Trailing newline
         ]
 
         for domain in valid_domains:
@@ -58,6 +62,12 @@ class TestDomainGenerator:
                 domain
             ), f"Should be invalid: {domain}"
 
+    def test_ascii_validator_rejects_idn(self):
+        """Test that the ASCII fast path does not accept IDN names."""
+        assert self.generator._is_valid_ascii_domain("example.com")
+        assert not self.generator._is_valid_ascii_domain("exаmple.com")
+        assert self.generator._is_valid_idn_domain("exаmple.com")
+
     def test_generate_omission_variants(self):
         """Test character omission variants."""
         domain = "test"
@@ -86,6 +96,28 @@ class TestDomainGenerator:
         assert any("r" in variant for variant in variants)
         assert any("y" in variant for variant in variants)
 
+    def test_generate_substitution_variants(self):
+        """Test character substitution variants for ASCII and IDN input."""
+        variants = list(self.generator._generate_substitution_variants("ab"))
+
+        assert len(variants) == 2 * 25
+        assert "bb" in variants
+        assert "az" in variants
+        assert "ab" not in variants
+
+        idn_variants = list(self.generator._generate_substitution_variants("é"))
+        assert len(idn_variants) == 26
+
+    def test_lookup_table_variants_skip_non_ascii(self):
+        """Test that table-driven generators ignore characters outside ASCII."""
+        domain = "tést"
+        keyboard = list(self.generator._generate_keyboard_variants(domain))
+        idn = list(self.generator._generate_idn_variants(domain))
+
+        assert "rést" in keyboard
+        assert all(variant[1] == "é" for variant in keyboard)
+        assert idn == []
+
     def test_generate_domain_variations(self):
         """Test complete domain variation generation."""
         # Limit variants for testing
@@ -134,3 +166,35 @@ class TestDomainGenerator:
         assert "mail-test" in variants
         assert "test-www" in variants
         assert "wwwtest" in variants
+
+    def test_generate_domain_variations_deterministic(self):
+        """Test that separate generators produce the same variations."""
+        tlds = {f"t{i}" for i in range(50)} | self.tlds
+        first = DomainGenerator(self.config, tlds)
+        second = DomainGenerator(self.config, set(sorted(tlds, reverse=True)))
+
+        assert list(first.generate_domain_variations("test.com")) == list(
+            second.generate_domain_variations("test.com")
+        )
+        assert first._get_relevant_tlds("com")[0] == "com"
+
+    def test_generate_variations_deduplicates_across_inputs(self):
+        """Test that variations shared between input domains are yielded once."""
+        variations = list(self.generator.generate_variations(["test.com", "test.com"]))
+
+        assert len(variations) == len(set(variations))
+        assert len(variations) > 0
+
+    def test_generate_variations_parallel(self):
+        """Test that process-pool generation matches the serial contract."""
+        self.config.max_variants_per_domain = 5
+        domains = [f"test{i}.com" for i in range(PARALLEL_MIN_DOMAINS)]
+
+        variations = list(self.generator.generate_variations(domains, workers=2))
+
+        assert len(variations) == len(set(variations))
+        assert len(variations) <= len(domains) * self.config.max_variants_per_domain
+        assert len(variations) > 0
+        for variant in variations:
+            assert self.generator._is_valid_domain_name(variant)
+        assert variations == list(self.generator.generate_variations(domains))
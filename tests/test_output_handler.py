@@ -0,0 +1,134 @@
+"""
+Tests for output handler functionality.
+"""
+
+import csv
+import io
+import json
+import sys
+
+from domaingenchecker.config import OutputConfig, OutputFormat
+from domaingenchecker.dns_checker import DNSResult, DNSStatus
+from domaingenchecker.output_handler import OutputHandler
+
+
+class TestOutputHandler:
+    """Test cases for OutputHandler class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.results = [
+            DNSResult(
+                domain="example.com",
+                status=DNSStatus.RESOLVED,
+                ip_addresses=["192.0.2.1", "2001:db8::1"],
+                response_time=0.25,
+                timestamp=1.5,
+            ),
+            DNSResult(
+                domain="exampl.com",
+                status=DNSStatus.UNRESOLVED,
+                ip_addresses=[],
+                response_time=0.5,
+                timestamp=1.75,
+            ),
+            DNSResult(
+                domain="examp1e.com",
+                status=DNSStatus.ERROR,
+                ip_addresses=[],
+                response_time=0.0,
+                error_message='bad "reply", retry\nlater',
+                timestamp=2.0,
+            ),
+        ]
+
+    def test_csv_output_round_trip(self, tmp_path):
+        """Test that CSV output is readable by the csv module."""
+        output_file = tmp_path / "results.csv"
+        handler = OutputHandler(
+            OutputConfig(
+                format=OutputFormat.CSV,
+                output_file=output_file,
+                include_statistics=False,
+            )
+        )
+        handler.add_results(self.results)
+        handler.generate_output()
+
+        with open(output_file, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+        assert [row["domain"] for row in rows] == [
+            "example.com",
+            "exampl.com",
+            "examp1e.com",
+        ]
+        assert rows[0]["ip_addresses"] == "192.0.2.1;2001:db8::1"
+        assert rows[0]["response_time"] == "0.25"
+        assert rows[2]["status"] == "error"
+        assert rows[2]["error_message"] == 'bad "reply", retry\nlater'
+
+    def test_json_output_excludes_unresolved(self, tmp_path):
+        """Test that unresolved domains can be left out of the output."""
+        output_file = tmp_path / "results.json"
+        handler = OutputHandler(
+            OutputConfig(
+                format=OutputFormat.JSON,
+                output_file=output_file,
+                include_unresolved=False,
+            )
+        )
+        handler.add_results(self.results)
+        handler.generate_output()
+
+        data = json.loads(output_file.read_text(encoding="utf-8"))
+
+        assert [r["domain"] for r in data["results"]] == [
+            "example.com",
+            "examp1e.com",
+        ]
+        assert data["metadata"]["total_domains"] == 3
+        assert data["statistics"]["unresolved_count"] == 1
+
+    def test_csv_output_to_stdout(self, capsys):
+        """Test that CSV without an output file goes to standard output."""
+        handler = OutputHandler(
+            OutputConfig(format=OutputFormat.CSV, include_statistics=False)
+        )
+        handler.add_results(self.results[:1])
+        handler.generate_output()
+
+        lines = capsys.readouterr().out.splitlines()
+
+        assert lines[0].startswith("domain,status,ip_addresses")
+        assert lines[1].startswith("example.com,resolved,")
+
+    def test_text_output_to_pipe_is_plain(self, capsys):
+        """Test that text output without a terminal is written without Rich."""
+        handler = OutputHandler(OutputConfig(format=OutputFormat.TEXT))
+        handler.add_results(self.results[:1])
+        handler.generate_output()
+
+        out = capsys.readouterr().out
+
+        assert "Domain: example.com\nStatus: Resolved\n" in out
+        assert "Statistics\nTotal Domains: 1\n" in out
+        assert "[bold" not in out
+
+    def test_csv_output_to_stdout_keeps_crlf(self, monkeypatch):
+        """Test that CSV rows on stdout are not newline-translated."""
+        raw = io.BytesIO()
+        # Emulate a Windows console stream, which translates "\n" to "\r\n"
+        stdout = io.TextIOWrapper(raw, encoding="utf-8", newline="\r\n")
+        monkeypatch.setattr(sys, "stdout", stdout)
+        handler = OutputHandler(
+            OutputConfig(format=OutputFormat.CSV, include_statistics=False)
+        )
+        handler.add_results(self.results[:1])
+        handler.generate_output()
+
+        out = raw.getvalue()
+
+        assert out.count(b"\r\n") == 2
+        assert b"\r\r\n" not in out
+        assert not stdout.closed